@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+import glob
+import os
+import queue
+import tempfile
+import threading
+import time
+from inference import FEATURE_NAMES
+
+BATCH_SIZE = 32
+CHUNK_ROWS = 65536
+SHUFFLE_BUFFER = 100000
+PREFETCH_BATCHES = 64
+HOLDOUT = 0.2
+
+END_OF_EPOCH = object()
+
+def offer(out, stop, item):
+    # Blocking put that gives up once the consumer has stopped iterating,
+    # so an abandoned epoch never leaves the producer thread stuck.
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def list_shards(pattern):
+    shards = sorted(glob.glob(pattern))
+    if not shards:
+        raise FileNotFoundError(f"No feature shards match {pattern}")
+    return shards
+
+def write_shards(df, output_dir, rows_per_shard=CHUNK_ROWS):
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i, start in enumerate(range(0, len(df), rows_per_shard)):
+        path = f'{output_dir}/features_{i:05d}.csv'
+        df.iloc[start:start + rows_per_shard].to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+def read_chunks(shards, chunk_rows=CHUNK_ROWS, normal_only=True, holdout=0.0,
+                subset='train', seed=42):
+    # Yields feature arrays chunk by chunk. The train/validation split is
+    # decided per row from a generator seeded by (seed, shard, chunk), so
+    # the same rows land in the same subset every epoch without an index.
+    columns = FEATURE_NAMES + (['label'] if normal_only else [])
+    for shard_id, shard in shards:
+        reader = pd.read_csv(shard, usecols=columns, chunksize=chunk_rows)
+        for chunk_id, chunk in enumerate(reader):
+            if normal_only:
+                chunk = chunk[chunk['label'].values == 0]
+            X = chunk[FEATURE_NAMES].values
+
+            if holdout > 0:
+                rng = np.random.default_rng([seed, shard_id, chunk_id])
+                in_holdout = rng.random(len(X)) < holdout
+                X = X[in_holdout] if subset == 'val' else X[~in_holdout]
+
+            if len(X):
+                yield X
+
+def fit_scaler(shard_pattern, **kwargs):
+    scaler = StandardScaler()
+    shards = list(enumerate(list_shards(shard_pattern)))
+    for X in read_chunks(shards, **kwargs):
+        scaler.partial_fit(X)
+    return scaler
+
+class ShardedFeatureLoader:
+    def __init__(self, shard_pattern, scaler=None, batch_size=BATCH_SIZE,
+                 shuffle_buffer=SHUFFLE_BUFFER, prefetch=PREFETCH_BATCHES,
+                 chunk_rows=CHUNK_ROWS, normal_only=True, holdout=HOLDOUT,
+                 subset='train', shuffle=True, seed=42):
+        self.shards = list(enumerate(list_shards(shard_pattern)))
+        self.scaler = scaler
+        self.batch_size = batch_size
+        self.shuffle_buffer = shuffle_buffer
+        self.prefetch = prefetch
+        self.chunk_rows = chunk_rows
+        self.normal_only = normal_only
+        self.holdout = holdout
+        self.subset = subset
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+
+    def transform(self, X):
+        if self.scaler is None:
+            return X.astype(np.float32)
+        return ((X - self.scaler.mean_) / self.scaler.scale_).astype(np.float32)
+
+    def shuffled_rows(self, rng):
+        # Shuffle buffer: incoming chunks are mixed into a bounded pool and
+        # a random selection is released whenever the pool overflows, so
+        # memory stays at shuffle_buffer rows regardless of dataset size.
+        shards = list(self.shards)
+        if self.shuffle:
+            rng.shuffle(shards)
+
+        pool = np.empty((0, len(FEATURE_NAMES)))
+        chunks = read_chunks(shards, self.chunk_rows, self.normal_only,
+                             self.holdout, self.subset, self.seed)
+        for X in chunks:
+            if not self.shuffle:
+                yield X
+                continue
+
+            pool = np.concatenate([pool, X])
+            overflow = len(pool) - self.shuffle_buffer
+            if overflow > 0:
+                order = rng.permutation(len(pool))
+                yield pool[order[:overflow]]
+                pool = pool[order[overflow:]]
+
+        if len(pool):
+            yield pool[rng.permutation(len(pool))]
+
+    def batches(self, rng):
+        pending = np.empty((0, len(FEATURE_NAMES)))
+        for rows in self.shuffled_rows(rng):
+            pending = np.concatenate([pending, rows]) if len(pending) else rows
+            n_full = len(pending) // self.batch_size * self.batch_size
+            for start in range(0, n_full, self.batch_size):
+                yield self.transform(pending[start:start + self.batch_size])
+            pending = pending[n_full:]
+
+        if len(pending):
+            yield self.transform(pending)
+
+    def producer(self, out, stop, rng):
+        try:
+            for batch in self.batches(rng):
+                if not offer(out, stop, batch):
+                    return
+            offer(out, stop, END_OF_EPOCH)
+        except BaseException as exc:
+            offer(out, stop, exc)
+
+    def __iter__(self):
+        # Batches are produced on a background thread (file reads, parsing,
+        # shuffling and scaling) while the consumer trains on earlier ones.
+        rng = np.random.default_rng([self.seed, self.epoch])
+        self.epoch += 1
+
+        out = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        worker = threading.Thread(target=self.producer, args=(out, stop, rng), daemon=True)
+        worker.start()
+
+        try:
+            while True:
+                item = out.get()
+                if item is END_OF_EPOCH:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+
+    def autoencoder_pairs(self):
+        for batch in self:
+            yield batch, batch
+
+    def to_tf_dataset(self):
+        import tensorflow as tf
+
+        signature = (
+            tf.TensorSpec(shape=(None, len(FEATURE_NAMES)), dtype=tf.float32),
+            tf.TensorSpec(shape=(None, len(FEATURE_NAMES)), dtype=tf.float32)
+        )
+        return tf.data.Dataset.from_generator(self.autoencoder_pairs, output_signature=signature)
+
+def benchmark(shard_pattern, step_time=0.002):
+    # Compares a consumer that waits on the loader with one that also
+    # "trains" for step_time per batch, to show I/O overlapping compute.
+    scaler = fit_scaler(shard_pattern)
+    loader = ShardedFeatureLoader(shard_pattern, scaler, batch_size=1024)
+
+    start = time.perf_counter()
+    rows = sum(len(batch) for batch in loader)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    n_batches = 0
+    for batch in loader:
+        time.sleep(step_time)
+        n_batches += 1
+    overlapped = time.perf_counter() - start
+
+    print(f"Rows streamed: {rows:,}")
+    print(f"Loader only: {load_time:.2f} s ({rows / load_time:,.0f} rows/s)")
+    print(f"Loader + {step_time * 1000:.1f} ms/step compute: {overlapped:.2f} s "
+          f"(serial would be ~{load_time + n_batches * step_time:.2f} s)")
+
+def main():
+    print("=" * 60)
+    print("Sharded Feature Loader Benchmark")
+    print("=" * 60)
+
+    df = pd.read_csv('../datasets/combined_dataset.csv')
+    big = pd.concat([df] * 2000, ignore_index=True)
+    with tempfile.TemporaryDirectory() as shard_dir:
+        shards = write_shards(big, shard_dir)
+        print(f"\nShards: {len(shards)} x {CHUNK_ROWS:,} rows\n")
+        benchmark(f'{shard_dir}/*.csv')
+
+if __name__ == "__main__":
+    main()
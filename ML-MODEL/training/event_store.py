@@ -0,0 +1,383 @@
+import numpy as np
+from bisect import bisect_left
+import json
+import os
+import tempfile
+import time
+
+EVENTS_DIR = '../events'
+SEGMENT_RECORDS = 1 << 20
+
+MINUTE_MS = 60 * 1000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+RESOLUTIONS = {'minute': MINUTE_MS, 'hour': HOUR_MS}
+
+# One fixed-width record per SensorMessage received by the gateway, with the
+# receive time in milliseconds since the epoch and the node's anomaly score.
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('node', '<u2'),
+    ('flag', 'u1'),
+    ('vibration', '<f4'),
+    ('score', '<f4')
+])
+
+ROLLUP_DTYPE = np.dtype([
+    ('bucket', '<i8'),
+    ('count', '<u4'),
+    ('alarms', '<u4'),
+    ('vibration_min', '<f4'),
+    ('vibration_max', '<f4'),
+    ('vibration_sum', '<f8'),
+    ('score_min', '<f4'),
+    ('score_max', '<f4'),
+    ('score_sum', '<f8')
+])
+
+DEMO_NODES = 20
+DEMO_DAYS = 90
+DEMO_INTERVAL_MS = 60 * 1000
+DEMO_QUERY_NODE = 17
+DEMO_REPEATS = 20
+
+def make_records(nodes, timestamps, vibration, scores, flags):
+    n = len(timestamps)
+    records = np.empty(n, dtype=RECORD_DTYPE)
+    records['node'] = nodes
+    records['timestamp'] = timestamps
+    records['vibration'] = vibration
+    records['score'] = scores
+    records['flag'] = flags
+    return records
+
+def build_rollups(records, resolution_ms):
+    # records must be sorted by timestamp; one output row per occupied bucket.
+    buckets = records['timestamp'] // resolution_ms
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+
+    rollups = np.empty(len(starts), dtype=ROLLUP_DTYPE)
+    rollups['bucket'] = buckets[starts]
+    rollups['count'] = np.diff(np.append(starts, len(records)))
+    rollups['alarms'] = np.add.reduceat(records['flag'].astype(np.uint32), starts)
+    for field in ('vibration', 'score'):
+        values = records[field]
+        rollups[f'{field}_min'] = np.minimum.reduceat(values, starts)
+        rollups[f'{field}_max'] = np.maximum.reduceat(values, starts)
+        rollups[f'{field}_sum'] = np.add.reduceat(values.astype(np.float64), starts)
+    return rollups
+
+def merge_rollups(rollups):
+    # Combine rows that share a bucket (input sorted by bucket).
+    if len(rollups) == 0:
+        return rollups
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(rollups['bucket'])) + 1])
+    if len(starts) == len(rollups):
+        return rollups
+
+    merged = np.empty(len(starts), dtype=ROLLUP_DTYPE)
+    merged['bucket'] = rollups['bucket'][starts]
+    for field in ('count', 'alarms', 'vibration_sum', 'score_sum'):
+        merged[field] = np.add.reduceat(rollups[field], starts)
+    for field in ('vibration_min', 'score_min'):
+        merged[field] = np.minimum.reduceat(rollups[field], starts)
+    for field in ('vibration_max', 'score_max'):
+        merged[field] = np.maximum.reduceat(rollups[field], starts)
+    return merged
+
+def write_at(path, offset, data):
+    # Writes at a fixed offset and cuts the file there, so bytes left past
+    # the committed length by an interrupted append are overwritten, never
+    # appended after.
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+
+class EventStore:
+    def __init__(self, root=EVENTS_DIR, segment_records=SEGMENT_RECORDS):
+        self.root = root
+        self.segment_records = segment_records
+        os.makedirs(root, exist_ok=True)
+
+        self.index_path = f'{root}/index.json'
+        self.index = {}
+        self.rollup_index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r') as f:
+                saved = json.load(f)
+            self.index = {int(node): entries for node, entries in saved['segments'].items()}
+            self.rollup_index = {int(node): entries for node, entries in saved['rollups'].items()}
+            self.recover()
+
+    def node_dir(self, node):
+        return f'{self.root}/nodes/{node:05d}'
+
+    def nodes(self):
+        return sorted(self.index)
+
+    def save_index(self):
+        # The index is the commit point: it holds the record count of every
+        # segment and the row count and last row of every rollup file, and is
+        # replaced atomically once a whole batch has been written.
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'segments': {str(node): entries for node, entries in self.index.items()},
+                'rollups': {str(node): entries for node, entries in self.rollup_index.items()}
+            }, f)
+        os.replace(tmp_path, self.index_path)
+
+    def recover(self):
+        # Roll back anything an interrupted append wrote past the index:
+        # trailing segment records, trailing rollup rows, and an in-place
+        # merge into the last rollup row.
+        for node, entries in self.index.items():
+            for entry in entries:
+                path = f'{self.node_dir(node)}/{entry["file"]}'
+                if os.path.exists(path) and os.path.getsize(path) > entry['count'] * RECORD_DTYPE.itemsize:
+                    os.truncate(path, entry['count'] * RECORD_DTYPE.itemsize)
+
+        for node, resolutions in self.rollup_index.items():
+            for entry in resolutions.values():
+                path = f'{self.node_dir(node)}/{entry["file"]}'
+                committed = entry['rows'] * ROLLUP_DTYPE.itemsize
+                last = np.array(tuple(entry['last']), dtype=ROLLUP_DTYPE).tobytes()
+                with open(path, 'r+b') as f:
+                    f.seek(committed - ROLLUP_DTYPE.itemsize)
+                    stale = f.read() != last
+                if stale:
+                    write_at(path, committed - ROLLUP_DTYPE.itemsize, last)
+
+    def append(self, records):
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        if len(records) == 0:
+            return
+
+        order = np.lexsort((records['timestamp'], records['node']))
+        records = records[order]
+        nodes, starts = np.unique(records['node'], return_index=True)
+        bounds = np.append(starts, len(records))
+
+        obsolete = []
+        for node, lo, hi in zip(nodes, bounds[:-1], bounds[1:]):
+            obsolete += self.append_node(int(node), records[lo:hi])
+
+        self.save_index()
+        for path in obsolete:
+            os.remove(path)
+
+    def append_node(self, node, records):
+        os.makedirs(self.node_dir(node), exist_ok=True)
+        entries = self.index.setdefault(node, [])
+
+        position = 0
+        while position < len(records):
+            tail = entries[-1] if entries else None
+            in_order = tail is not None and records['timestamp'][position] >= tail['last']
+            if not in_order or tail['count'] >= self.segment_records:
+                # Out-of-order data starts a fresh segment, so every segment
+                # stays sorted and searchable with a binary search.
+                tail = {'file': f'segment_{len(entries):06d}.bin', 'first': None, 'last': None, 'count': 0}
+                entries.append(tail)
+
+            chunk = records[position:position + self.segment_records - tail['count']]
+            write_at(f'{self.node_dir(node)}/{tail["file"]}', tail['count'] * RECORD_DTYPE.itemsize, chunk.tobytes())
+
+            if tail['first'] is None:
+                tail['first'] = int(chunk['timestamp'][0])
+            tail['last'] = int(chunk['timestamp'][-1])
+            tail['count'] += len(chunk)
+            position += len(chunk)
+
+        obsolete = []
+        for resolution, resolution_ms in RESOLUTIONS.items():
+            obsolete += self.update_rollups(node, resolution, build_rollups(records, resolution_ms))
+        return obsolete
+
+    def update_rollups(self, node, resolution, new):
+        # Returns files that become unused once the index has been saved.
+        entry = self.rollup_index.setdefault(node, {}).setdefault(
+            resolution, {'file': f'rollup_{resolution}_000000.bin', 'generation': 0, 'rows': 0, 'last': None})
+        path = f'{self.node_dir(node)}/{entry["file"]}'
+        existing = self.load_rollups(node, resolution)
+        obsolete = []
+
+        if len(existing) == 0 or new['bucket'][0] > existing['bucket'][-1]:
+            write_at(path, len(existing) * ROLLUP_DTYPE.itemsize, new.tobytes())
+            entry['rows'] = len(existing) + len(new)
+        elif new['bucket'][0] == existing['bucket'][-1]:
+            # Common case: the batch continues the last (partial) bucket.
+            # The committed copy of that row lives in the index, so recover()
+            # can undo this in-place merge if the batch never commits.
+            last = merge_rollups(np.concatenate([existing[-1:], new[:1]]))
+            write_at(path, (len(existing) - 1) * ROLLUP_DTYPE.itemsize, last.tobytes() + new[1:].tobytes())
+            entry['rows'] = len(existing) + len(new) - 1
+        else:
+            # Out-of-order rows rewrite the file under a new name; the old
+            # one stays valid for the current index until it is replaced.
+            combined = np.concatenate([existing, new])
+            combined = merge_rollups(combined[np.argsort(combined['bucket'], kind='stable')])
+            entry['generation'] += 1
+            entry['file'] = f'rollup_{resolution}_{entry["generation"]:06d}.bin'
+            combined.tofile(f'{self.node_dir(node)}/{entry["file"]}')
+            entry['rows'] = len(combined)
+            obsolete.append(path)
+
+        entry['last'] = list(self.load_rollups(node, resolution)[-1].tolist())
+        return obsolete
+
+    def load_rollups(self, node, resolution):
+        entry = self.rollup_index.get(node, {}).get(resolution)
+        if entry is None or entry['rows'] == 0:
+            return np.empty(0, dtype=ROLLUP_DTYPE)
+        path = f'{self.node_dir(node)}/{entry["file"]}'
+        return np.memmap(path, dtype=ROLLUP_DTYPE, mode='r', shape=(entry['rows'],))
+
+    def segments(self, node, start, end):
+        for entry in self.index.get(node, []):
+            if entry['count'] == 0 or entry['last'] < start or entry['first'] >= end:
+                continue
+            path = f'{self.node_dir(node)}/{entry["file"]}'
+            yield np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(entry['count'],))
+
+    def segment_slices(self, node, start, end):
+        # Memmap views of the records in [start, end), one per segment.
+        # bisect probes O(log n) single elements instead of letting
+        # searchsorted copy the strided timestamp column.
+        if start >= end:
+            return
+        for segment in self.segments(node, start, end):
+            timestamps = segment['timestamp']
+            lo = bisect_left(timestamps, start)
+            hi = bisect_left(timestamps, end, lo)
+            if hi > lo:
+                yield segment[lo:hi]
+
+    def query(self, node, start, end):
+        # Raw records for one node in [start, end), sorted by time.
+        parts = [np.array(part) for part in self.segment_slices(node, start, end)]
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        records = np.concatenate(parts)
+        if len(parts) > 1:
+            records = records[np.argsort(records['timestamp'], kind='stable')]
+        return records
+
+    def rollup_slice(self, node, start, end, resolution='minute'):
+        # Memmap view of the rollup rows whose bucket starts in [start, end).
+        resolution_ms = RESOLUTIONS[resolution]
+        rollups = self.load_rollups(node, resolution)
+        buckets = rollups['bucket']
+        lo = bisect_left(buckets, -(-start // resolution_ms))
+        hi = bisect_left(buckets, -(-end // resolution_ms), lo)
+        return rollups[lo:hi]
+
+    def rollups(self, node, start, end, resolution='minute'):
+        return np.array(self.rollup_slice(node, start, end, resolution))
+
+    def raw_rollups(self, node, start, end):
+        records = self.query(node, start, end)
+        if len(records) == 0:
+            return np.empty(0, dtype=ROLLUP_DTYPE)
+        return build_rollups(records, MINUTE_MS)
+
+    def range_rollups(self, node, start, end):
+        # Rollup rows that cover [start, end) exactly, from the coarsest data
+        # available for each part: hour rollups in the middle, minute rollups
+        # for the partial hours and raw records for the partial minutes at
+        # either edge.
+        first_minute = -(-start // MINUTE_MS) * MINUTE_MS
+        last_minute = end // MINUTE_MS * MINUTE_MS
+        if first_minute >= last_minute:
+            return self.raw_rollups(node, start, end)
+
+        first_hour = -(-first_minute // HOUR_MS) * HOUR_MS
+        last_hour = last_minute // HOUR_MS * HOUR_MS
+        if first_hour < last_hour:
+            parts = [self.rollup_slice(node, first_hour, last_hour, 'hour'),
+                     self.rollup_slice(node, first_minute, first_hour),
+                     self.rollup_slice(node, last_hour, last_minute)]
+        else:
+            parts = [self.rollup_slice(node, first_minute, last_minute)]
+
+        parts += [self.raw_rollups(node, start, first_minute), self.raw_rollups(node, last_minute, end)]
+        return np.concatenate(parts)
+
+    def summary(self, node, start, end):
+        rollups = self.range_rollups(node, start, end)
+        count = int(rollups['count'].sum())
+        if count == 0:
+            return {'count': 0, 'alarms': 0}
+        return {
+            'count': count,
+            'alarms': int(rollups['alarms'].sum()),
+            'vibration_min': float(rollups['vibration_min'].min()),
+            'vibration_max': float(rollups['vibration_max'].max()),
+            'vibration_mean': float(rollups['vibration_sum'].sum() / count),
+            'score_min': float(rollups['score_min'].min()),
+            'score_max': float(rollups['score_max'].max()),
+            'score_mean': float(rollups['score_sum'].sum() / count)
+        }
+
+    def alarm_count(self, node, start, end):
+        return int(self.range_rollups(node, start, end)['alarms'].sum())
+
+    def raw_alarm_count(self, node, start, end):
+        return sum(int(part['flag'].sum()) for part in self.segment_slices(node, start, end))
+
+    def fleet_alarm_counts(self, start, end):
+        return {node: self.alarm_count(node, start, end) for node in self.nodes()}
+
+def build_demo_store(root):
+    rng = np.random.default_rng(42)
+    end = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+    start = end - DEMO_DAYS * DAY_MS
+    timestamps = np.arange(start, end, DEMO_INTERVAL_MS)
+
+    store = EventStore(root)
+    for day in range(DEMO_DAYS):
+        day_ts = timestamps[(timestamps >= start + day * DAY_MS) & (timestamps < start + (day + 1) * DAY_MS)]
+        nodes = np.repeat(np.arange(1, DEMO_NODES + 1), len(day_ts))
+        ts = np.tile(day_ts, DEMO_NODES)
+        scores = rng.gamma(2.0, 0.5, size=len(ts)).astype(np.float32)
+        vibration = (9.8 + rng.standard_normal(len(ts))).astype(np.float32)
+        store.append(make_records(nodes, ts, vibration, scores, scores > 3.0))
+
+    return store, end
+
+def time_query(fn, *args):
+    best = np.inf
+    for _ in range(DEMO_REPEATS):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def main():
+    print("=" * 60)
+    print("Gateway Event Store Demo")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as root:
+        start_time = time.perf_counter()
+        store, now = build_demo_store(root)
+        elapsed = time.perf_counter() - start_time
+        total = sum(entry['count'] for entries in store.index.values() for entry in entries)
+
+        print(f"\nIngested {total:,} records for {DEMO_NODES} nodes over {DEMO_DAYS} days "
+              f"in {elapsed:.2f} s ({total / elapsed:,.0f} records/s)")
+
+        ms, records = time_query(store.query, DEMO_QUERY_NODE, now - DAY_MS, now)
+        print(f"\nLast 24h for node {DEMO_QUERY_NODE}: {len(records):,} records in {ms:.2f} ms")
+
+        ms, summary = time_query(store.summary, DEMO_QUERY_NODE, now - DAY_MS - 12345, now)
+        print(f"Last 24h summary for node {DEMO_QUERY_NODE} (hour/minute rollups + raw edges): {ms:.2f} ms")
+        print(f"  mean vibration {summary['vibration_mean']:.2f}, max score {summary['score_max']:.2f}, "
+              f"alarms {summary['alarms']}")
+
+        ms, counts = time_query(store.fleet_alarm_counts, now - 30 * DAY_MS - 12345, now)
+        print(f"\nFleet alarm counts, last 30 days: {sum(counts.values()):,} alarms in {ms:.2f} ms")
+
+if __name__ == "__main__":
+    main()
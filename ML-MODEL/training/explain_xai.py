@@ -2,8 +2,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import shap
-import json
 from tensorflow import keras
+from inference import load_weights
+from train_classifier import has_classifier, load_classifier
 
 INPUT_DIM = 8
 HIDDEN_DIM = 4
@@ -26,13 +27,11 @@ def load_model_and_data():
     print("Loading Model and Data for XAI Analysis")
     print("=" * 60)
 
-    with open('../models/model_config.json', 'r') as f:
-        config = json.load(f)
-
-    encoder_weights = np.load('../models/encoder_weights.npy')
-    encoder_bias = np.load('../models/encoder_bias.npy')
-    decoder_weights = np.load('../models/decoder_weights.npy')
-    decoder_bias = np.load('../models/decoder_bias.npy')
+    weights = load_weights('../models')
+    encoder_weights = weights['encoder_weights']
+    encoder_bias = weights['encoder_bias']
+    decoder_weights = weights['decoder_weights']
+    decoder_bias = weights['decoder_bias']
 
     model = Autoencoder(INPUT_DIM, HIDDEN_DIM)
     _ = model(np.zeros((1, INPUT_DIM)))
@@ -153,6 +152,15 @@ def generate_explanation_logic(shap_values, feature_names):
     for i, idx in enumerate(top_features):
         print(f"  {i+1}. {feature_names[idx]:18s} ({importance_pct[idx]:.1f}%)")
 
+    if has_classifier():
+        classifier = load_classifier()
+        print(f"\nFault Type Classifier (classifyFault in model_weights.h):")
+        for c, name in enumerate(classifier['classes']):
+            top = np.argsort(np.abs(classifier['weights'][:, c]))[::-1][:2]
+            drivers = ', '.join(f"{feature_names[i]} ({classifier['weights'][i, c]:+.2f})" for i in top)
+            print(f"  - {name:16s} ← {drivers}")
+        return
+
     print(f"\nRecommended Threshold Logic:")
     print(f"  - If harmonic_ratio > 1.5 → Bearing Fault (120Hz)")
     print(f"  - If dominant_freq < 50 → Rotor Imbalance (35Hz)")
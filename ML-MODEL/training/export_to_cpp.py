@@ -1,25 +1,86 @@
-import numpy as np
-import json
+import os
+from inference import load_weights
+from train_classifier import has_classifier, load_classifier
 
-def export_weights_to_cpp():
+def classifier_to_cpp(models_dir):
+    config = load_classifier(models_dir)
+    classifier_weights = config['weights']
+    classifier_bias = config['bias']
+
+    n_classes = len(config['classes'])
+
+    cpp_code = f'''
+#define NUM_FAULT_CLASSES {n_classes}
+
+const char* const FAULT_CLASS_NAMES[NUM_FAULT_CLASSES] = {{
+  {', '.join(f'"{name}"' for name in config['classes'])}
+}};
+
+'''
+
+    cpp_code += f'const float classifier_mean[INPUT_DIM] = {{\n  '
+    cpp_code += ', '.join([f'{m:.6f}f' for m in config["scaler_mean"]])
+    cpp_code += '\n};\n\n'
+
+    cpp_code += f'const float classifier_std[INPUT_DIM] = {{\n  '
+    cpp_code += ', '.join([f'{s:.6f}f' for s in config["scaler_std"]])
+    cpp_code += '\n};\n\n'
+
+    cpp_code += 'const float classifier_weights[INPUT_DIM][NUM_FAULT_CLASSES] = {\n'
+    for i in range(classifier_weights.shape[0]):
+        cpp_code += '  {' + ', '.join([f'{w:.6f}f' for w in classifier_weights[i]]) + '}'
+        if i < classifier_weights.shape[0] - 1:
+            cpp_code += ','
+        cpp_code += '\n'
+    cpp_code += '};\n\n'
+
+    cpp_code += f'const float classifier_bias[NUM_FAULT_CLASSES] = {{\n  '
+    cpp_code += ', '.join([f'{b:.6f}f' for b in classifier_bias])
+    cpp_code += '\n};\n\n'
+
+    cpp_code += '''int classifyFault(float features[INPUT_DIM]) {
+  float scaled[INPUT_DIM];
+  for(int i = 0; i < INPUT_DIM; i++) {
+    scaled[i] = (features[i] - classifier_mean[i]) / classifier_std[i];
+  }
+
+  int best = 0;
+  float bestLogit = 0;
+  for(int c = 0; c < NUM_FAULT_CLASSES; c++) {
+    float logit = classifier_bias[c];
+    for(int i = 0; i < INPUT_DIM; i++) {
+      logit += scaled[i] * classifier_weights[i][c];
+    }
+    if(c == 0 || logit > bestLogit) {
+      best = c;
+      bestLogit = logit;
+    }
+  }
+  return best;
+}
+'''
+
+    print(f"\nFault classifier included: {', '.join(config['classes'])}")
+
+    return cpp_code
+
+def export_weights_to_cpp(models_dir='../models', output_path='../exports/model_weights.h'):
     print("=" * 60)
     print("Exporting Model Weights to C++ Header File")
     print("=" * 60)
 
-    encoder_weights = np.load('../models/encoder_weights.npy')
-    encoder_bias = np.load('../models/encoder_bias.npy')
-    decoder_weights = np.load('../models/decoder_weights.npy')
-    decoder_bias = np.load('../models/decoder_bias.npy')
-
-    with open('../models/model_config.json', 'r') as f:
-        config = json.load(f)
+    config = load_weights(models_dir)
+    encoder_weights = config['encoder_weights']
+    encoder_bias = config['encoder_bias']
+    decoder_weights = config['decoder_weights']
+    decoder_bias = config['decoder_bias']
 
     cpp_code = f'''#ifndef MODEL_WEIGHTS_H
 #define MODEL_WEIGHTS_H
 
 #define INPUT_DIM {config["input_dim"]}
 #define HIDDEN_DIM {config["hidden_dim"]}
-#define RECONSTRUCTION_THRESHOLD {config["threshold"]:.4f}f
+#define RECONSTRUCTION_THRESHOLD {config["threshold"]:#.9g}f
 
 const float encoder_weights[INPUT_DIM][HIDDEN_DIM] = {{
 '''
@@ -102,11 +163,14 @@ bool isAnomalous(float features[INPUT_DIM]) {
   float reconError = runInference(features);
   return (reconError > RECONSTRUCTION_THRESHOLD);
 }
-
-#endif
 '''
 
-    output_path = '../exports/model_weights.h'
+    if has_classifier(models_dir):
+        cpp_code += classifier_to_cpp(models_dir)
+
+    cpp_code += '\n#endif\n'
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
     with open(output_path, 'w') as f:
         f.write(cpp_code)
 
@@ -129,7 +193,10 @@ bool isAnomalous(float features[INPUT_DIM]) {
     print("  1. Copy model_weights.h to your ESP32 project")
     print("  2. #include \"model_weights.h\"")
     print("  3. Call runInference(features) or isAnomalous(features)")
+    print("  4. If exported, call classifyFault(features) on anomalous windows")
     print("\n✅ Ready for embedded deployment\n")
 
+    return output_path
+
 if __name__ == "__main__":
     export_weights_to_cpp()
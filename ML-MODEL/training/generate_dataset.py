@@ -3,97 +3,28 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
 import os
+from plot_utils import plot_decimated
+from signal_scenarios import generate_scenario
+from spectral_features import window_features
 
 SAMPLE_RATE = 100
 DURATION_NORMAL = 100
 DURATION_FAULT = 20
 NOISE_LEVEL = 0.5
 
-def generate_normal_vibration(duration, sample_rate):
-    t = np.linspace(0, duration, int(duration * sample_rate))
-    base_freq = 60.0
-
-    signal = (
-        2.0 * np.sin(2 * np.pi * base_freq * t) +
-        0.5 * np.sin(2 * np.pi * 2 * base_freq * t) +
-        0.3 * np.sin(2 * np.pi * 3 * base_freq * t) +
-        NOISE_LEVEL * np.random.randn(len(t))
-    )
-
-    modulation = 1.0 + 0.1 * np.sin(2 * np.pi * 0.5 * t)
-    signal = signal * modulation
-    signal = signal + 9.8
+RNG = np.random.default_rng()
 
-    return t, signal
+def generate_normal_vibration(duration, sample_rate):
+    return generate_scenario('normal', duration, sample_rate, RNG, noise=NOISE_LEVEL)
 
 def generate_bearing_fault(duration, sample_rate):
-    t = np.linspace(0, duration, int(duration * sample_rate))
-    base_freq = 60.0
-    fault_freq = 120.0
-
-    signal = (
-        2.0 * np.sin(2 * np.pi * base_freq * t) +
-        0.5 * np.sin(2 * np.pi * 2 * base_freq * t) +
-        3.0 * np.sin(2 * np.pi * fault_freq * t) +
-        1.5 * np.sin(2 * np.pi * 2 * fault_freq * t) +
-        NOISE_LEVEL * np.random.randn(len(t))
-    )
-
-    modulation = 1.0 + 0.15 * np.sin(2 * np.pi * 0.5 * t)
-    signal = signal * modulation + 9.8
-
-    return t, signal
+    return generate_scenario('bearing_fault', duration, sample_rate, RNG, noise=NOISE_LEVEL)
 
 def generate_rotor_imbalance(duration, sample_rate):
-    t = np.linspace(0, duration, int(duration * sample_rate))
-    base_freq = 60.0
-    imbalance_freq = 35.0
-
-    signal = (
-        2.0 * np.sin(2 * np.pi * base_freq * t) +
-        0.5 * np.sin(2 * np.pi * 2 * base_freq * t) +
-        2.5 * np.sin(2 * np.pi * imbalance_freq * t) +
-        1.0 * np.sin(2 * np.pi * 2 * imbalance_freq * t) +
-        NOISE_LEVEL * np.random.randn(len(t))
-    )
-
-    modulation = 1.0 + 0.2 * np.sin(2 * np.pi * 0.3 * t)
-    signal = signal * modulation + 9.8
-
-    return t, signal
+    return generate_scenario('rotor_imbalance', duration, sample_rate, RNG, noise=NOISE_LEVEL)
 
 def extract_features(signal, window_size=64):
-    features = []
-
-    for i in range(0, len(signal) - window_size, window_size // 2):
-        window = signal[i:i+window_size]
-
-        mean = np.mean(window)
-        peak = np.max(window)
-        rms = np.sqrt(np.mean(window**2))
-
-        skewness = np.mean(((window - mean) / np.std(window))**3) if np.std(window) > 0 else 0
-        kurtosis = np.mean(((window - mean) / np.std(window))**4) if np.std(window) > 0 else 0
-
-        # Remove DC component (gravity) for FFT analysis
-        window_centered = window - mean
-        fft = np.fft.fft(window_centered)
-        freqs = np.fft.fftfreq(len(window), 1/SAMPLE_RATE)
-        
-        # Find peak frequency (ignoring 0Hz index since we centered it, but argmax might still pick small noise near 0)
-        # We look at the positive half of the spectrum
-        positive_freqs = freqs[:len(window)//2]
-        positive_fft = np.abs(fft[:len(window)//2])
-        
-        # Skip the first bin (0Hz) just in case
-        dominant_freq = abs(positive_freqs[np.argmax(positive_fft[1:]) + 1])
-
-        harmonic_ratio = peak / mean if mean > 0 else 0
-        energy = np.sum(window**2) / len(window)
-
-        features.append([mean, peak, rms, skewness, kurtosis, dominant_freq, harmonic_ratio, energy])
-
-    return np.array(features)
+    return window_features(signal, window_size, SAMPLE_RATE)
 
 def create_dataset():
     print("=" * 60)
@@ -168,19 +99,18 @@ def create_dataset():
 
 def plot_signals(normal, bearing, rotor):
     fig, axes = plt.subplots(3, 1, figsize=(12, 8))
-    t = np.linspace(0, 10, 1000)
 
-    axes[0].plot(t, normal, 'g-', linewidth=0.5)
+    plot_decimated(axes[0], np.arange(len(normal)) / SAMPLE_RATE, normal, 'g-', dpi=150, linewidth=0.5)
     axes[0].set_title('Normal Vibration', fontsize=12, fontweight='bold')
     axes[0].set_ylabel('Vibration (m/s²)')
     axes[0].grid(True, alpha=0.3)
 
-    axes[1].plot(t, bearing, 'r-', linewidth=0.5)
+    plot_decimated(axes[1], np.arange(len(bearing)) / SAMPLE_RATE, bearing, 'r-', dpi=150, linewidth=0.5)
     axes[1].set_title('Bearing Fault (120Hz spike)', fontsize=12, fontweight='bold')
     axes[1].set_ylabel('Vibration (m/s²)')
     axes[1].grid(True, alpha=0.3)
 
-    axes[2].plot(t, rotor, 'b-', linewidth=0.5)
+    plot_decimated(axes[2], np.arange(len(rotor)) / SAMPLE_RATE, rotor, 'b-', dpi=150, linewidth=0.5)
     axes[2].set_title('Rotor Imbalance (35Hz spike)', fontsize=12, fontweight='bold')
     axes[2].set_ylabel('Vibration (m/s²)')
     axes[2].set_xlabel('Time (s)')
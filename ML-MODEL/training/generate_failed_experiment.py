@@ -1,10 +1,11 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 import os
+from plot_utils import SAVE_DPI, density_scatter, plot_decimated
+from projection import FeatureProjector
+from signal_scenarios import synthesize
+from spectral_features import frame_signal
 
 # Settings for a "Failed" Experiment
 SAMPLE_RATE = 100
@@ -12,37 +13,30 @@ DURATION = 20
 NOISE_LEVEL = 2.5  # Very High Noise
 FAULT_STRENGTH = 0.2  # Very Weak Fault Signal (buried in noise)
 
-def generate_messy_signal(duration, freq, is_fault=False):
-    t = np.linspace(0, duration, int(duration * SAMPLE_RATE))
-    
-    # Gravity (Mean)
-    signal = np.ones_like(t) * 9.8
-    
-    # High Random Noise
-    signal += np.random.randn(len(t)) * NOISE_LEVEL
-    
-    # Weak Fault Pattern (Hard to detect)
-    if is_fault:
-        signal += np.sin(2 * np.pi * freq * t) * FAULT_STRENGTH
-    else:
-        # Normal motor vibration (also weak)
-        signal += np.sin(2 * np.pi * 10 * t) * FAULT_STRENGTH
+RNG = np.random.default_rng()
+
+def messy_spec(freq, is_fault=False, noise_level=NOISE_LEVEL, fault_strength=FAULT_STRENGTH):
+    # Gravity (Mean) + High Random Noise + a weak tone. The fault pattern is
+    # hard to detect; normal motor vibration (10Hz) is equally weak.
+    return {
+        'offset': 9.8,
+        'harmonics': [(freq if is_fault else 10.0, fault_strength)],
+        'noise': noise_level
+    }
+
+def generate_messy_signal(duration, freq, is_fault=False, noise_level=NOISE_LEVEL,
+                          fault_strength=FAULT_STRENGTH, rng=RNG):
+    spec = messy_spec(freq, is_fault, noise_level, fault_strength)
+    n_samples = int(duration * SAMPLE_RATE)
+    signal = synthesize(spec, 1, n_samples, SAMPLE_RATE, rng)[0]
 
-    return t, signal
+    return np.arange(n_samples) / SAMPLE_RATE, signal
 
 def extract_basic_features(signal, window_size=64):
-    features = []
-    for i in range(0, len(signal) - window_size, window_size // 2):
-        window = signal[i:i+window_size]
-        
-        # Poor Feature Selection (Just basic stats, no FFT, no centering)
-        mean = np.mean(window)
-        std = np.std(window)
-        peak = np.max(window)
-        low = np.min(window)
-        
-        features.append([mean, std, peak, low])
-    return np.array(features)
+    # Poor Feature Selection (Just basic stats, no FFT, no centering)
+    frames = frame_signal(np.asarray(signal, dtype=float), window_size)
+    return np.column_stack([frames.mean(axis=1), frames.std(axis=1),
+                            frames.max(axis=1), frames.min(axis=1)])
 
 def create_failed_experiment():
     output_dir = '../datasets/failed_experiment'
@@ -76,41 +70,39 @@ def create_failed_experiment():
     plt.figure(figsize=(12, 8))
     
     plt.subplot(3, 1, 1)
-    plt.plot(t[:500], normal_sig[:500], color='green', alpha=0.7)
+    plot_decimated(plt.gca(), t[:500], normal_sig[:500], color='green', alpha=0.7)
     plt.title('Early Prototype: Normal Signal (High Noise)', fontweight='bold')
     plt.ylabel('Vibration')
     
     plt.subplot(3, 1, 2)
-    plt.plot(t[:500], bearing_sig[:500], color='red', alpha=0.7)
+    plot_decimated(plt.gca(), t[:500], bearing_sig[:500], color='red', alpha=0.7)
     plt.title('Early Prototype: Bearing Fault (Signal Lost in Noise)', fontweight='bold')
     plt.ylabel('Vibration')
     
     plt.subplot(3, 1, 3)
-    plt.plot(t[:500], rotor_sig[:500], color='blue', alpha=0.7)
+    plot_decimated(plt.gca(), t[:500], rotor_sig[:500], color='blue', alpha=0.7)
     plt.title('Early Prototype: Rotor Imbalance (Indistinguishable)', fontweight='bold')
     plt.xlabel('Time (s)')
     plt.ylabel('Vibration')
     
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/failed_signals.png', dpi=300)
+    plt.savefig(f'{output_dir}/failed_signals.png', dpi=SAVE_DPI)
     plt.close()
 
     # 5. Visualization 2: Overlapping PCA (The "Blob")
     x = df[cols].values
-    x = StandardScaler().fit_transform(x)
-    pca = PCA(n_components=2)
-    components = pca.fit_transform(x)
+    projector = FeatureProjector(feature_names=cols).fit(x)
+    components = projector.transform(x)
     
-    plt.figure(figsize=(10, 8))
-    sns.scatterplot(x=components[:,0], y=components[:,1], hue=df['Status'], 
-                    palette={'Normal':'green', 'Bearing Fault':'red', 'Rotor Imbalance':'blue'},
-                    s=80, alpha=0.6)
+    fig, ax = plt.subplots(figsize=(10, 8))
+    handles = density_scatter(ax, components[:,0], components[:,1], df['Status'],
+                              palette={'Normal':'green', 'Bearing Fault':'red', 'Rotor Imbalance':'blue'})
     
-    plt.title('Initial Model Results: Complete Overlap (Failure)', fontsize=14, fontweight='bold')
-    plt.xlabel('PC1')
-    plt.ylabel('PC2')
-    plt.legend()
-    plt.savefig(f'{output_dir}/failed_pca.png', dpi=300)
+    ax.set_title('Initial Model Results: Complete Overlap (Failure)', fontsize=14, fontweight='bold')
+    ax.set_xlabel('PC1')
+    ax.set_ylabel('PC2')
+    ax.legend(handles=handles)
+    plt.savefig(f'{output_dir}/failed_pca.png', dpi=SAVE_DPI)
     plt.close()
 
 if __name__ == "__main__":
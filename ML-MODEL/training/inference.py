@@ -0,0 +1,56 @@
+import numpy as np
+import json
+import os
+from model_bundle import bundle_path, read_bundle
+
+MODELS_DIR = '../models'
+# Column order of the feature vector everywhere: datasets, loader, model
+# input, classifier and the exported C header.
+FEATURE_NAMES = ['mean', 'peak', 'rms', 'skewness', 'kurtosis',
+                 'dominant_freq', 'harmonic_ratio', 'energy']
+
+def load_weights(models_dir=MODELS_DIR):
+    if os.path.exists(bundle_path(models_dir)):
+        header, tensors = read_bundle(bundle_path(models_dir))
+        attributes = header['attributes']
+        if attributes['feature_names'] != FEATURE_NAMES:
+            raise ValueError(f"{bundle_path(models_dir)} was trained on features {attributes['feature_names']}, "
+                             f"expected {FEATURE_NAMES}")
+        weights = dict(tensors)
+        weights.update({
+            'input_dim': attributes['input_dim'],
+            'hidden_dim': attributes['hidden_dim'],
+            'threshold': attributes['threshold'],
+            'feature_names': attributes['feature_names'],
+            'metadata': header['metadata']
+        })
+        return weights
+
+    # Model directories exported before the single-file bundle existed.
+    with open(f'{models_dir}/model_config.json', 'r') as f:
+        config = json.load(f)
+
+    return {
+        'input_dim': config['input_dim'],
+        'hidden_dim': config['hidden_dim'],
+        'threshold': config['threshold'],
+        'encoder_weights': np.load(f'{models_dir}/encoder_weights.npy'),
+        'encoder_bias': np.load(f'{models_dir}/encoder_bias.npy'),
+        'decoder_weights': np.load(f'{models_dir}/decoder_weights.npy'),
+        'decoder_bias': np.load(f'{models_dir}/decoder_bias.npy'),
+        'scaler_mean': np.asarray(config['scaler_mean']),
+        'scaler_std': np.asarray(config['scaler_std'])
+    }
+
+def reconstruction_error(weights, X, dtype=np.float64):
+    # Same arithmetic as the Keras Autoencoder and the exported runInference:
+    # standardise, Dense+ReLU encoder, linear decoder, mean squared error.
+    X = np.asarray(X, dtype=dtype)
+    scaled = (X - weights['scaler_mean'].astype(dtype, copy=False)) / weights['scaler_std'].astype(dtype, copy=False)
+    hidden = scaled @ weights['encoder_weights'].astype(dtype, copy=False) + weights['encoder_bias'].astype(dtype, copy=False)
+    np.maximum(hidden, 0, out=hidden)
+    reconstructed = hidden @ weights['decoder_weights'].astype(dtype, copy=False) + weights['decoder_bias'].astype(dtype, copy=False)
+    return np.mean(np.square(scaled - reconstructed), axis=1)
+
+def is_anomalous(weights, X):
+    return reconstruction_error(weights, X) > weights['threshold']
@@ -0,0 +1,144 @@
+import numpy as np
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+
+BUNDLE_NAME = 'model_bundle.bin'
+MAGIC = b'AEBUNDLE'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Fixed-size prefix: magic, format version, header length, data offset,
+# data length and a SHA-256 of everything after the prefix. The JSON header
+# and the tensor blobs follow; every blob starts on an ALIGNMENT boundary so
+# it can be viewed in place from a memory map.
+PREFIX = struct.Struct('<8sIIQQ32s')
+
+def align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def bundle_path(models_dir):
+    return f'{models_dir}/{BUNDLE_NAME}'
+
+def write_bundle(path, tensors, attributes, metadata=None):
+    # tensors: name -> array. attributes: small JSON values shared by every
+    # consumer (threshold, dims, feature names...). metadata: free-form
+    # training information.
+    layout = {}
+    offset = 0
+    blobs = []
+    for name, array in tensors.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.byteorder == '>':
+            array = array.astype(array.dtype.newbyteorder('<'))
+        offset = align(offset)
+        layout[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset,
+            'nbytes': array.nbytes
+        }
+        blobs.append((offset, array))
+        offset += array.nbytes
+    data_len = offset
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'tensors': layout,
+        'attributes': attributes,
+        'metadata': metadata or {}
+    }
+    header_bytes = json.dumps(header, indent=1).encode('utf-8')
+    data_offset = align(PREFIX.size + len(header_bytes))
+
+    body = bytearray(data_offset - PREFIX.size + data_len)
+    body[:len(header_bytes)] = header_bytes
+    base = data_offset - PREFIX.size
+    for blob_offset, array in blobs:
+        body[base + blob_offset:base + blob_offset + array.nbytes] = array.tobytes()
+
+    prefix = PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes), data_offset,
+                         data_len, hashlib.sha256(body).digest())
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(prefix)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+def read_bundle(path, verify=True):
+    # Returns (header, tensors). Tensors are read-only NumPy views onto a
+    # shared memory map of the file, so nothing is copied or parsed beyond
+    # the JSON header, and every worker mapping the same file shares pages.
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < PREFIX.size:
+        raise ValueError(f"{path} is too small to be a model bundle")
+    magic, version, header_len, data_offset, data_len, digest = PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a model bundle")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"{path} uses bundle format {version}, this reader supports {FORMAT_VERSION}")
+    if len(buffer) < data_offset + data_len:
+        raise ValueError(f"{path} is truncated")
+    if verify and hashlib.sha256(memoryview(buffer)[PREFIX.size:data_offset + data_len]).digest() != digest:
+        raise ValueError(f"{path} failed checksum verification")
+
+    header = json.loads(bytes(buffer[PREFIX.size:PREFIX.size + header_len]).decode('utf-8'))
+
+    tensors = {}
+    for name, info in header['tensors'].items():
+        dtype = np.dtype(info['dtype'])
+        count = int(np.prod(info['shape'], dtype=np.int64))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_offset + info['offset'])
+        tensors[name] = array.reshape(info['shape'])
+
+    return header, tensors
+
+def update_bundle(path, tensors=None, attributes=None, metadata=None):
+    # Rewrites the bundle with extra or replaced tensors and attributes.
+    header, existing = read_bundle(path)
+    merged_tensors = {name: np.array(array) for name, array in existing.items()}
+    merged_tensors.update(tensors or {})
+    merged_attributes = dict(header['attributes'], **(attributes or {}))
+    merged_metadata = dict(header['metadata'], **(metadata or {}))
+    write_bundle(path, merged_tensors, merged_attributes, merged_metadata)
+
+def main():
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else bundle_path('../models')
+
+    start = time.perf_counter()
+    header, tensors = read_bundle(path)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    print("Model Bundle")
+    print("=" * 60)
+    print(f"\nPath: {path}")
+    print(f"Format version: {header['format_version']}")
+    print(f"Created: {header['created']}")
+    print(f"Load + verify time: {elapsed * 1000:.3f} ms")
+
+    print("\nAttributes:")
+    for key, value in header['attributes'].items():
+        print(f"  {key}: {value}")
+
+    print("\nTensors:")
+    for name, array in tensors.items():
+        print(f"  {name:24s} {str(array.dtype):8s} {tuple(array.shape)}")
+
+    if header['metadata']:
+        print("\nMetadata:")
+        for key, value in header['metadata'].items():
+            print(f"  {key}: {value}")
+
+if __name__ == "__main__":
+    main()
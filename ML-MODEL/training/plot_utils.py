@@ -0,0 +1,119 @@
+import numpy as np
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Patch
+
+# Large-data figures are saved at 150 dpi, like the training plots; 300 dpi
+# quadruples the raster size without showing anything the density plots lack.
+SAVE_DPI = 150
+DENSITY_BINS = 200
+MAX_DENSITY_ALPHA = 0.85
+
+def axis_pixel_width(ax, dpi=SAVE_DPI):
+    fig = ax.get_figure()
+    return max(1, int(ax.get_window_extent().width * dpi / fig.dpi))
+
+def minmax_decimate(t, y, n_buckets):
+    # Keep the min and max sample of every bucket (in time order) so spikes
+    # survive while the number of plotted points stays ~2 per pixel column.
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return t, y
+
+    size = int(np.ceil(n / n_buckets))
+    n_buckets = int(np.ceil(n / size))
+    padded = np.pad(y, (0, size * n_buckets - n), mode='edge').reshape(n_buckets, size)
+
+    idx_min = np.argmin(padded, axis=1)
+    idx_max = np.argmax(padded, axis=1)
+    base = np.arange(n_buckets) * size
+
+    idx = np.empty(2 * n_buckets, dtype=np.int64)
+    idx[0::2] = base + np.minimum(idx_min, idx_max)
+    idx[1::2] = base + np.maximum(idx_min, idx_max)
+    idx = np.minimum(idx, n - 1)
+
+    return t[idx], y[idx]
+
+def plot_decimated(ax, t, y, *args, dpi=SAVE_DPI, **kwargs):
+    t_dec, y_dec = minmax_decimate(np.asarray(t), np.asarray(y), axis_pixel_width(ax, dpi))
+    return ax.plot(t_dec, y_dec, *args, **kwargs)
+
+def density_scatter(ax, x, y, labels, palette, bins=DENSITY_BINS):
+    # 2D-histogram rendering: one RGBA layer per class, alpha scaled by
+    # log-density, so the draw cost depends on the grid size, not the row count.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    labels = np.asarray(labels)
+
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y, labels = x[finite], y[finite], labels[finite]
+
+    x_range = [x.min(), x.max()] if len(x) else [0.0, 1.0]
+    y_range = [y.min(), y.max()] if len(y) else [0.0, 1.0]
+    if x_range[0] == x_range[1]:
+        x_range = [x_range[0] - 0.5, x_range[1] + 0.5]
+    if y_range[0] == y_range[1]:
+        y_range = [y_range[0] - 0.5, y_range[1] + 0.5]
+    extent = [x_range[0], x_range[1], y_range[0], y_range[1]]
+
+    handles = []
+    for label, color in palette.items():
+        mask = labels == label
+        if not np.any(mask):
+            continue
+
+        counts, _, _ = np.histogram2d(x[mask], y[mask], bins=bins, range=[x_range, y_range])
+        density = np.log1p(counts.T)
+
+        image = np.zeros(density.shape + (4,))
+        image[..., :3] = to_rgba(color)[:3]
+        image[..., 3] = density / density.max() * MAX_DENSITY_ALPHA
+
+        ax.imshow(image, origin='lower', extent=extent, aspect='auto', interpolation='nearest')
+        handles.append(Patch(color=color, label=f'{label} ({int(mask.sum())})'))
+
+    ax.set_xlim(x_range)
+    ax.set_ylim(y_range)
+
+    return handles
+
+def shared_histogram(ax, arrays, labels, colors, bins=50, alpha=0.7):
+    # Bin every series on one grid with np.histogram and draw the outlines,
+    # instead of building one bar patch per bin per series.
+    finite = [a[np.isfinite(a)] for a in arrays]
+    lo = min(a.min() for a in finite if len(a))
+    hi = max(a.max() for a in finite if len(a))
+    edges = np.linspace(lo, hi, bins + 1)
+
+    for values, label, color in zip(finite, labels, colors):
+        counts, _ = np.histogram(values, bins=edges)
+        ax.stairs(counts, edges, fill=True, alpha=alpha, label=label, color=color)
+
+    return edges
+
+def box_stats(values, label, whis=1.5):
+    # Quartiles and Tukey whiskers as the dict matplotlib's bxp expects.
+    # Outliers are not kept, so the drawn artists do not grow with the data.
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+    return {
+        'label': label,
+        'q1': q1,
+        'med': med,
+        'q3': q3,
+        'whislo': inside.min(),
+        'whishi': inside.max(),
+        'fliers': []
+    }
+
+def quantile_boxplot(ax, groups, labels, colors):
+    stats = [box_stats(values, label) for values, label in zip(groups, labels)]
+    boxes = ax.bxp(stats, showfliers=False, patch_artist=True)
+    for patch, color in zip(boxes['boxes'], colors):
+        patch.set_facecolor(color)
+    for median in boxes['medians']:
+        median.set_color('black')
+    return boxes
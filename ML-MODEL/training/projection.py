@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import IncrementalPCA
+from sklearn.preprocessing import StandardScaler
+import json
+import os
+from inference import FEATURE_NAMES
+
+N_COMPONENTS = 2
+BATCH_SIZE = 4096
+MODELS_DIR = '../models'
+PREFIX = 'projection'
+
+PCA_STATE = ['components_', 'mean_', 'var_', 'singular_values_',
+             'explained_variance_', 'explained_variance_ratio_']
+
+def iter_batches(X, batch_size=BATCH_SIZE):
+    for start in range(0, len(X), batch_size):
+        yield X[start:start + batch_size]
+
+def merge_small_batches(batches, min_rows):
+    # IncrementalPCA needs at least n_components rows per partial_fit, so a
+    # short batch (typically the tail) is folded into the one before it.
+    pending = None
+    for batch in batches:
+        if pending is None:
+            pending = batch
+        elif len(batch) < min_rows or len(pending) < min_rows:
+            pending = np.concatenate([pending, batch])
+        else:
+            yield pending
+            pending = batch
+    if pending is not None:
+        yield pending
+
+class FeatureProjector:
+    def __init__(self, feature_names=FEATURE_NAMES, n_components=N_COMPONENTS, batch_size=BATCH_SIZE):
+        self.feature_names = list(feature_names)
+        self.n_components = n_components
+        self.batch_size = batch_size
+        self.scaler = StandardScaler()
+        self.pca = IncrementalPCA(n_components=n_components)
+        self.n_rows_fit = 0
+
+    def fit(self, X):
+        return self.fit_stream(lambda: iter_batches(X, self.batch_size))
+
+    def fit_stream(self, make_batches):
+        # Two passes over the batches: the scaler must be final before the
+        # PCA sees scaled data, otherwise early batches use a different frame.
+        self.scaler = StandardScaler()
+        for batch in make_batches():
+            self.scaler.partial_fit(batch)
+        self.n_rows_fit = int(np.max(self.scaler.n_samples_seen_))
+
+        self.pca = IncrementalPCA(n_components=self.n_components)
+        for batch in merge_small_batches(make_batches(), self.n_components):
+            self.partial_fit(batch)
+
+        return self
+
+    def partial_fit(self, batch):
+        # The scaler stays frozen so projections from different days remain
+        # comparable; only the principal axes follow the new data.
+        self.pca.partial_fit(self.scaler.transform(batch))
+        return self
+
+    def transform(self, X):
+        out = np.empty((len(X), self.n_components))
+        for start in range(0, len(X), self.batch_size):
+            stop = start + self.batch_size
+            out[start:stop] = self.pca.transform(self.scaler.transform(X[start:stop]))
+        return out
+
+    def transform_stream(self, batches):
+        for batch in batches:
+            yield self.pca.transform(self.scaler.transform(batch))
+
+    @property
+    def explained_variance_ratio(self):
+        return self.pca.explained_variance_ratio_
+
+    def save(self, models_dir=MODELS_DIR):
+        os.makedirs(models_dir, exist_ok=True)
+
+        for name in PCA_STATE:
+            np.save(f'{models_dir}/{PREFIX}_{name.rstrip("_")}.npy', getattr(self.pca, name))
+        np.save(f'{models_dir}/{PREFIX}_scaler_mean.npy', self.scaler.mean_)
+        np.save(f'{models_dir}/{PREFIX}_scaler_var.npy', self.scaler.var_)
+
+        config = {
+            'feature_names': self.feature_names,
+            'n_components': self.n_components,
+            'batch_size': self.batch_size,
+            'n_samples_seen': int(self.pca.n_samples_seen_),
+            'n_rows_fit': int(self.n_rows_fit),
+            'scaler_n_samples_seen': int(np.max(self.scaler.n_samples_seen_)),
+            'noise_variance': float(self.pca.noise_variance_)
+        }
+
+        with open(f'{models_dir}/{PREFIX}_config.json', 'w') as f:
+            json.dump(config, f, indent=2)
+
+    @classmethod
+    def load(cls, models_dir=MODELS_DIR):
+        with open(f'{models_dir}/{PREFIX}_config.json', 'r') as f:
+            config = json.load(f)
+
+        projector = cls(config['feature_names'], config['n_components'], config['batch_size'])
+
+        for name in PCA_STATE:
+            setattr(projector.pca, name, np.load(f'{models_dir}/{PREFIX}_{name.rstrip("_")}.npy'))
+        projector.pca.n_samples_seen_ = config['n_samples_seen']
+        projector.n_rows_fit = config.get('n_rows_fit', config['scaler_n_samples_seen'])
+        projector.pca.noise_variance_ = config['noise_variance']
+        projector.pca.n_components_ = config['n_components']
+        projector.pca.n_features_in_ = len(config['feature_names'])
+        projector.pca.batch_size_ = config['batch_size']
+
+        projector.scaler.mean_ = np.load(f'{models_dir}/{PREFIX}_scaler_mean.npy')
+        projector.scaler.var_ = np.load(f'{models_dir}/{PREFIX}_scaler_var.npy')
+        projector.scaler.scale_ = np.sqrt(projector.scaler.var_)
+        projector.scaler.scale_[projector.scaler.scale_ == 0] = 1.0
+        projector.scaler.n_samples_seen_ = config['scaler_n_samples_seen']
+        projector.scaler.n_features_in_ = len(config['feature_names'])
+
+        return projector
+
+    def update(self, X):
+        # Rows are taken to be appended over time: everything past the rows
+        # already seen is folded into the saved axes with partial_fit, so
+        # separability can be tracked without refitting on the whole history.
+        new_rows = np.asarray(X)[self.n_rows_fit:]
+        if len(new_rows) < self.n_components:
+            return 0
+        for batch in merge_small_batches(iter_batches(new_rows, self.batch_size), self.n_components):
+            self.partial_fit(batch)
+        self.n_rows_fit += len(new_rows)
+        return len(new_rows)
+
+    @classmethod
+    def load_or_fit(cls, X, feature_names=FEATURE_NAMES, models_dir=MODELS_DIR, refit=False):
+        if not refit and os.path.exists(f'{models_dir}/{PREFIX}_config.json'):
+            projector = cls.load(models_dir)
+            if projector.feature_names == list(feature_names):
+                n_new = projector.update(X)
+                if n_new:
+                    projector.save(models_dir)
+                    print(f"Projection updated with {n_new} new rows")
+                return projector
+            print(f"Saved projection in {models_dir} uses different features, refitting")
+        projector = cls(feature_names).fit(X)
+        projector.save(models_dir)
+        return projector
+
+def separability(projected, labels):
+    # Fisher criterion in projection space: between-class scatter over
+    # within-class scatter. Higher means the classes are further apart.
+    labels = np.asarray(labels)
+    classes, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    if len(classes) < 2:
+        return float('nan')
+
+    overall = projected.mean(axis=0)
+    sums = np.zeros((len(classes), projected.shape[1]))
+    np.add.at(sums, inverse, projected)
+    centroids = sums / counts[:, None]
+
+    between = np.sum(counts * np.sum((centroids - overall) ** 2, axis=1))
+    within = np.sum((projected - centroids[inverse]) ** 2)
+
+    return float(between / within) if within > 0 else float('inf')
+
+def main():
+    print("=" * 60)
+    print("Fitting Incremental Feature Projection")
+    print("=" * 60)
+
+    df = pd.read_csv('../datasets/combined_dataset.csv')
+    X = df[FEATURE_NAMES].values
+    labels = df['fault_type'].values
+
+    projector = FeatureProjector().fit(X)
+    projector.save()
+
+    ratio = projector.explained_variance_ratio
+    print(f"\nSamples seen: {projector.pca.n_samples_seen_}")
+    print(f"Explained variance: PC1 {ratio[0]:.1%}, PC2 {ratio[1]:.1%}")
+    print(f"Projection saved to: {MODELS_DIR}/{PREFIX}_*.npy")
+
+    print("\nSeparability per batch (Fisher ratio):")
+    batches = iter_batches(X, projector.batch_size)
+    for i, projected in enumerate(projector.transform_stream(batches)):
+        start = i * projector.batch_size
+        score = separability(projected, labels[start:start + len(projected)])
+        print(f"  Batch {i:4d} ({len(projected)} rows): {score:.3f}")
+
+    print(f"\nOverall separability: {separability(projector.transform(X), labels):.3f}")
+
+if __name__ == "__main__":
+    main()
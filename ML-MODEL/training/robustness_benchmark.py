@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+from generate_failed_experiment import SAMPLE_RATE, extract_basic_features, generate_messy_signal
+from plot_utils import SAVE_DPI
+from spectral_features import window_features
+
+NOISE_LEVELS = [0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0]
+FAULT_STRENGTHS = [0.1, 0.2, 0.35, 0.5, 0.75, 1.0, 1.5, 2.0]
+FAULT_FREQS = {'bearing_fault': 120, 'rotor_imbalance': 35}
+DURATION_NORMAL = 300
+DURATION_FAULT = 60
+# Separate normal recording the false-positive rate is measured on; the
+# validation split only calibrates the threshold.
+DURATION_NORMAL_TEST = 120
+VALIDATION_SPLIT = 0.2
+WORKERS = os.cpu_count()
+OUTPUT_DIR = '../datasets/robustness'
+
+FEATURE_SETS = {
+    'basic': extract_basic_features,
+    'full': lambda signal: window_features(signal, sample_rate=SAMPLE_RATE)
+}
+
+def fit_detector(X_train):
+    # Linear stand-in for the autoencoder: a linear 8 → 4 → 8 autoencoder
+    # trained on MSE converges to the PCA subspace, so the detector keeps
+    # half the principal components and scores by reconstruction error.
+    mean = X_train.mean(axis=0)
+    std = X_train.std(axis=0)
+    std[std == 0] = 1.0
+    _, _, vt = np.linalg.svd((X_train - mean) / std, full_matrices=False)
+    components = vt[:max(1, X_train.shape[1] // 2)]
+    return {'mean': mean, 'std': std, 'components': components}
+
+def score_detector(detector, X):
+    scaled = (X - detector['mean']) / detector['std']
+    reconstructed = scaled @ detector['components'].T @ detector['components']
+    return np.mean(np.square(scaled - reconstructed), axis=1)
+
+def evaluate_point(noise_level, fault_strength, seed=42):
+    rng = np.random.default_rng([seed, int(noise_level * 1000), int(fault_strength * 1000)])
+    timings = {}
+
+    start = time.perf_counter()
+    _, normal = generate_messy_signal(DURATION_NORMAL, 10, False, noise_level, fault_strength, rng)
+    _, normal_test = generate_messy_signal(DURATION_NORMAL_TEST, 10, False, noise_level, fault_strength, rng)
+    faults = {name: generate_messy_signal(DURATION_FAULT, freq, True, noise_level, fault_strength, rng)[1]
+              for name, freq in FAULT_FREQS.items()}
+    timings['generate_s'] = time.perf_counter() - start
+
+    rows = []
+    for feature_set, extract in FEATURE_SETS.items():
+        start = time.perf_counter()
+        X_normal = extract(normal)
+        X_normal_test = extract(normal_test)
+        X_faults = {name: extract(signal) for name, signal in faults.items()}
+        features_s = time.perf_counter() - start
+
+        split = int(len(X_normal) * (1 - VALIDATION_SPLIT))
+        order = rng.permutation(len(X_normal))
+        X_train, X_val = X_normal[order[:split]], X_normal[order[split:]]
+
+        start = time.perf_counter()
+        detector = fit_detector(X_train)
+        val_scores = score_detector(detector, X_val)
+        threshold = val_scores.mean() + 2 * val_scores.std()
+        train_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fault_scores = {name: score_detector(detector, X) for name, X in X_faults.items()}
+        test_scores = score_detector(detector, X_normal_test)
+        score_s = time.perf_counter() - start
+
+        row = {
+            'noise_level': noise_level,
+            'fault_strength': fault_strength,
+            'feature_set': feature_set,
+            'fpr': float(np.mean(test_scores > threshold)),
+            'generate_s': timings['generate_s'],
+            'features_s': features_s,
+            'train_s': train_s,
+            'score_s': score_s
+        }
+        for name, scores in fault_scores.items():
+            row[f'detection_{name}'] = float(np.mean(scores > threshold))
+        row['detection_rate'] = float(np.mean(np.concatenate(list(fault_scores.values())) > threshold))
+        rows.append(row)
+
+    return rows
+
+def run_sweep(workers=WORKERS):
+    grid = [(noise, strength) for noise in NOISE_LEVELS for strength in FAULT_STRENGTHS]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(evaluate_point, noise, strength) for noise, strength in grid]
+        results = [row for future in futures for row in future.result()]
+    return pd.DataFrame(results)
+
+def plot_heatmaps(results, path):
+    fig, axes = plt.subplots(2, 2, figsize=(14, 11))
+
+    for col, feature_set in enumerate(FEATURE_SETS):
+        subset = results[results['feature_set'] == feature_set]
+        for row, (metric, title, cmap) in enumerate([
+            ('detection_rate', 'Detection Rate', 'RdYlGn'),
+            ('fpr', 'False Positive Rate', 'RdYlGn_r')
+        ]):
+            grid = subset.pivot(index='noise_level', columns='fault_strength', values=metric)
+            ax = axes[row, col]
+            image = ax.imshow(grid.values, origin='lower', cmap=cmap, vmin=0, vmax=1, aspect='auto')
+
+            ax.set_xticks(range(len(grid.columns)))
+            ax.set_xticklabels([f'{v:g}' for v in grid.columns])
+            ax.set_yticks(range(len(grid.index)))
+            ax.set_yticklabels([f'{v:g}' for v in grid.index])
+            ax.set_xlabel('Fault Strength')
+            ax.set_ylabel('Noise Level')
+            ax.set_title(f'{title} ({feature_set} features)', fontsize=12, fontweight='bold')
+            ax.grid(False)
+
+            for i in range(grid.shape[0]):
+                for j in range(grid.shape[1]):
+                    ax.text(j, i, f'{grid.values[i, j]:.2f}', ha='center', va='center', fontsize=7)
+            fig.colorbar(image, ax=ax)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close()
+
+def main():
+    print("=" * 60)
+    print("Failure-Mode Robustness Benchmark")
+    print("=" * 60)
+    print(f"\nGrid: {len(NOISE_LEVELS)} noise levels x {len(FAULT_STRENGTHS)} fault strengths")
+    print(f"Workers: {WORKERS}")
+
+    start = time.perf_counter()
+    results = run_sweep()
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(f'{OUTPUT_DIR}/robustness_results.csv', index=False)
+    plot_heatmaps(results, f'{OUTPUT_DIR}/robustness_heatmap.png')
+
+    print(f"\nSweep time: {elapsed:.2f} s")
+    print(f"Results saved to: {OUTPUT_DIR}/robustness_results.csv")
+    print(f"Heatmap saved to: {OUTPUT_DIR}/robustness_heatmap.png")
+
+    print("\nMean detection rate by feature set:")
+    print(results.groupby('feature_set')[['detection_rate', 'fpr']].mean().to_string(float_format=lambda v: f'{v:.3f}'))
+
+    print("\nBreakdown points (lowest fault strength with detection >= 90%):")
+    detected = results[results['detection_rate'] >= 0.9]
+    breakdown = detected.groupby(['feature_set', 'noise_level'])['fault_strength'].min().unstack(0)
+    print(breakdown.reindex(index=NOISE_LEVELS, columns=list(FEATURE_SETS)).to_string(na_rep='never'))
+
+    stages = ['generate_s', 'features_s', 'train_s', 'score_s']
+    print("\nMean per-stage time per grid point (ms):")
+    print((results.groupby('feature_set')[stages].mean() * 1000).to_string(float_format=lambda v: f'{v:.2f}'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from inference import FEATURE_NAMES, load_weights, reconstruction_error
+
+MODELS_DIR = '../models'
+DATASET_PATH = '../datasets/combined_dataset.csv'
+WORKERS = 4
+MAX_BATCH = 256
+MAX_WAIT = 0.002
+QUEUE_CAPACITY = 8192
+LATENCY_SAMPLES = 100000
+
+LOAD_TEST_CLIENTS = 16
+LOAD_TEST_REQUESTS = 20000
+LOAD_TEST_IN_FLIGHT = 32
+
+STOP = object()
+
+class ServiceMetrics:
+    def __init__(self, max_batch, samples=LATENCY_SAMPLES):
+        self.lock = threading.Lock()
+        self.batch_sizes = np.zeros(max_batch + 1, dtype=np.int64)
+        # Ring buffers of the most recent queue waits and end-to-end times,
+        # so a long-running service keeps a fixed memory footprint.
+        self.queue_wait = np.zeros(samples)
+        self.latency = np.zeros(samples)
+        self.recorded = 0
+        self.completed = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+
+    def record_batch(self, enqueued, dequeued, finished):
+        n = len(enqueued)
+        with self.lock:
+            self.batch_sizes[n] += 1
+            self.completed += n
+            slots = np.arange(self.recorded, self.recorded + n) % len(self.queue_wait)
+            self.queue_wait[slots] = dequeued - enqueued
+            self.latency[slots] = finished - enqueued
+            self.recorded += n
+
+    def record_rejection(self):
+        with self.lock:
+            self.rejected += 1
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = time.perf_counter() - self.started
+            n = min(self.recorded, len(self.queue_wait))
+            queue_wait = self.queue_wait[:n].copy()
+            latency = self.latency[:n].copy()
+            histogram = self.batch_sizes.copy()
+            completed, rejected = self.completed, self.rejected
+
+        sizes = np.flatnonzero(histogram)
+        percentiles = [50, 95, 99]
+        return {
+            'completed': completed,
+            'rejected': rejected,
+            'elapsed_s': elapsed,
+            'throughput': completed / elapsed if elapsed > 0 else 0.0,
+            'batches': int(histogram.sum()),
+            'mean_batch_size': completed / max(int(histogram.sum()), 1),
+            'batch_size_histogram': dict(zip(sizes.tolist(), histogram[sizes].tolist())),
+            'queue_wait_ms': dict(zip(percentiles, np.percentile(queue_wait, percentiles) * 1000 if n else [0.0] * 3)),
+            'latency_ms': dict(zip(percentiles, np.percentile(latency, percentiles) * 1000 if n else [0.0] * 3))
+        }
+
+class ScoringService:
+    # Gateway-side scorer: callers submit one feature window at a time and
+    # get a Future back. Worker threads drain a bounded request queue into
+    # micro-batches of up to max_batch windows, waiting at most max_wait
+    # seconds after the oldest request before scoring what they have.
+    def __init__(self, models_dir=MODELS_DIR, workers=WORKERS, max_batch=MAX_BATCH,
+                 max_wait=MAX_WAIT, capacity=QUEUE_CAPACITY):
+        # Bundle tensors are read-only views over one memory map, so every
+        # worker shares the same weights without copying them.
+        self.weights = load_weights(models_dir)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue(maxsize=capacity)
+        self.metrics = ServiceMetrics(max_batch)
+        self.closed = False
+        # Guards `closed` and counts submits that passed the check but are
+        # still waiting for queue space, so close() never queues its
+        # sentinels ahead of an accepted request.
+        self.lock = threading.Condition()
+        self.submitting = 0
+        self.workers = [threading.Thread(target=self.worker, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, features, block=True, timeout=None):
+        # Backpressure: with block=True a full queue stalls the caller (up to
+        # timeout); with block=False, or once timeout expires, queue.Full is
+        # raised so the caller can shed load or retry later.
+        # A malformed window is refused here instead of failing every other
+        # request batched with it.
+        features = np.asarray(features, dtype=np.float64)
+        if features.shape != (self.weights['input_dim'],):
+            raise ValueError(f"Expected a feature window of shape ({self.weights['input_dim']},), "
+                             f"got {features.shape}")
+
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("ScoringService is closed")
+            self.submitting += 1
+
+        future = Future()
+        try:
+            self.requests.put((features, future, time.perf_counter()), block=block, timeout=timeout)
+        except queue.Full:
+            self.metrics.record_rejection()
+            raise
+        finally:
+            with self.lock:
+                self.submitting -= 1
+                self.lock.notify_all()
+        return future
+
+    def score(self, features, timeout=None):
+        return self.submit(features, timeout=timeout).result(timeout=timeout)
+
+    def next_batch(self):
+        # Returns (batch, stop). A sentinel ends the batch early and tells
+        # the worker to exit once the batch has been answered.
+        first = self.requests.get()
+        if first is STOP:
+            return [], True
+        batch = [first]
+        deadline = first[2] + self.max_wait
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def worker(self):
+        while True:
+            batch, stop = self.next_batch()
+            if batch:
+                self.run_batch(batch)
+            if stop:
+                return
+
+    def run_batch(self, batch):
+        dequeued = time.perf_counter()
+        # Requests their caller cancelled while queued are dropped; the rest
+        # are marked running so they can no longer be cancelled.
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        features, futures, enqueued = zip(*batch)
+        try:
+            scores = reconstruction_error(self.weights, np.vstack(features))
+            flags = scores > self.weights['threshold']
+            for future, score, flag in zip(futures, scores, flags):
+                future.set_result((float(score), bool(flag)))
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+        self.metrics.record_batch(np.asarray(enqueued), dequeued, time.perf_counter())
+
+    def close(self):
+        # New submits are refused, submits already accepted finish queueing,
+        # and one sentinel per worker goes in behind them, so every queued
+        # request is still scored before the workers exit.
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            while self.submitting:
+                self.lock.wait()
+
+        for _ in self.workers:
+            self.requests.put(STOP)
+        for worker in self.workers:
+            worker.join()
+
+        # Nothing should be left, but never leave a caller waiting forever.
+        while True:
+            try:
+                item = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("ScoringService closed before the request was scored"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def run_clients(service, X, n_requests, n_clients, in_flight=LOAD_TEST_IN_FLIGHT, block=True):
+    # Each client thread plays a group of nodes sending windows back to back,
+    # keeping up to in_flight requests outstanding like a gateway connection.
+    per_client = n_requests // n_clients
+    results = [[] for _ in range(n_clients)]
+
+    def client(c):
+        rows = X[np.arange(c * per_client, (c + 1) * per_client) % len(X)]
+        pending = deque()
+        for row in rows:
+            if len(pending) >= in_flight:
+                results[c].append(pending.popleft().result())
+            try:
+                pending.append(service.submit(row, block=block))
+            except queue.Full:
+                continue
+        results[c].extend(future.result() for future in pending)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [r for client_results in results for r in client_results]
+
+def print_metrics(title, metrics):
+    print(f"\n{title}")
+    print(f"  Completed:          {metrics['completed']:,} ({metrics['rejected']:,} rejected)")
+    print(f"  Throughput:         {metrics['throughput']:,.0f} windows/s")
+    print(f"  Batches:            {metrics['batches']:,} (mean size {metrics['mean_batch_size']:.1f})")
+    print(f"  Queue wait p50/p95/p99: " + ' / '.join(f"{v:.3f}" for v in metrics['queue_wait_ms'].values()) + " ms")
+    print(f"  Latency p50/p95/p99:    " + ' / '.join(f"{v:.3f}" for v in metrics['latency_ms'].values()) + " ms")
+
+    histogram = metrics['batch_size_histogram']
+    edges = [1, 2, 5, 17, 65, 129, max(histogram, default=1) + 1]
+    print("  Batch size histogram:")
+    for low, high in zip(edges[:-1], edges[1:]):
+        count = sum(n for size, n in histogram.items() if low <= size < high)
+        if count:
+            label = f"{low}" if high == low + 1 else f"{low}-{high - 1}"
+            print(f"    {label:>9s}: {count:,}")
+
+def main():
+    print("=" * 60)
+    print("Scoring Service Load Test")
+    print("=" * 60)
+
+    df = pd.read_csv(DATASET_PATH)
+    X = df[FEATURE_NAMES].values
+    weights = load_weights(MODELS_DIR)
+
+    print(f"\nWorkers: {WORKERS}, max batch: {MAX_BATCH}, max wait: {MAX_WAIT * 1000:.1f} ms, "
+          f"queue capacity: {QUEUE_CAPACITY:,}")
+    print(f"Clients: {LOAD_TEST_CLIENTS}, requests: {LOAD_TEST_REQUESTS:,}")
+
+    # Baseline: one synchronous model call per window, as a naive gateway would.
+    rows = X[np.arange(LOAD_TEST_REQUESTS) % len(X)]
+    start = time.perf_counter()
+    for row in rows:
+        reconstruction_error(weights, row[None, :])
+    baseline_time = time.perf_counter() - start
+    print(f"\nPer-request scoring:  {LOAD_TEST_REQUESTS / baseline_time:,.0f} windows/s")
+
+    with ScoringService() as service:
+        results = run_clients(service, X, LOAD_TEST_REQUESTS, LOAD_TEST_CLIENTS)
+        metrics = service.metrics.snapshot()
+        print_metrics("Micro-batched (blocking submit):", metrics)
+
+        scores = np.array([score for score, _ in results])
+        expected = reconstruction_error(weights, X[np.arange(len(scores)) % len(X)])
+        print(f"  Max |score - direct|: {np.abs(np.sort(scores) - np.sort(expected)).max():.2e}")
+        print(f"  Speedup vs per-request: {metrics['throughput'] / (LOAD_TEST_REQUESTS / baseline_time):.1f}x")
+
+    # Overload: a tiny queue and non-blocking submits, so excess requests are
+    # rejected at the door instead of piling up unbounded latency.
+    with ScoringService(workers=1, capacity=64) as service:
+        run_clients(service, X, LOAD_TEST_REQUESTS, LOAD_TEST_CLIENTS, in_flight=LOAD_TEST_REQUESTS, block=False)
+        print_metrics("Overload (capacity 64, 1 worker, non-blocking submit):", service.metrics.snapshot())
+
+    print("\n" + "=" * 60)
+    print("Load Test Complete!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import numpy as np
+import time
+
+SAMPLE_RATE = 100
+CHUNK_SIZE = 65536
+
+# Declarative motor scenarios. Harmonics are (frequency Hz, amplitude) pairs,
+# modulation is (frequency Hz, depth) applied multiplicatively, and the fault
+# block adds its own harmonics scaled by an onset/ramp envelope. Onset may be
+# a (min, max) range in seconds, in which case every motor draws its own.
+SCENARIOS = {
+    'normal': {
+        'offset': 9.8,
+        'harmonics': [(60.0, 2.0), (120.0, 0.5), (180.0, 0.3)],
+        'modulation': (0.5, 0.1),
+        'noise': 0.5
+    },
+    'bearing_fault': {
+        'offset': 9.8,
+        'harmonics': [(60.0, 2.0), (120.0, 0.5)],
+        'modulation': (0.5, 0.15),
+        'noise': 0.5,
+        'fault': {'harmonics': [(120.0, 3.0), (240.0, 1.5)]}
+    },
+    'rotor_imbalance': {
+        'offset': 9.8,
+        'harmonics': [(60.0, 2.0), (120.0, 0.5)],
+        'modulation': (0.3, 0.2),
+        'noise': 0.5,
+        'fault': {'harmonics': [(35.0, 2.5), (70.0, 1.0)]}
+    },
+    'bearing_degradation': {
+        'offset': 9.8,
+        'harmonics': [(60.0, 2.0), (120.0, 0.5), (180.0, 0.3)],
+        'modulation': (0.5, 0.1),
+        'noise': 0.5,
+        'random_phase': True,
+        'fault': {'harmonics': [(120.0, 3.0), (240.0, 1.5)], 'onset': (600.0, 3000.0), 'ramp': 1800.0}
+    }
+}
+
+LOAD_TEST_SCENARIO = 'bearing_degradation'
+LOAD_TEST_MOTORS = 64
+LOAD_TEST_SAMPLES = 1_562_500  # per motor, 10^8 samples in total
+
+def draw_motor_params(spec, n_motors, rng):
+    # Per-motor random parameters are drawn once per run so that every chunk
+    # of a streamed run sees the same phases and fault onsets.
+    fault = spec.get('fault')
+    harmonics = spec['harmonics'] + (fault['harmonics'] if fault else [])
+
+    if spec.get('random_phase', False):
+        phases = rng.uniform(0, 2 * np.pi, size=(len(harmonics), n_motors, 1))
+    else:
+        phases = np.zeros((len(harmonics), n_motors, 1))
+
+    onset = fault.get('onset', 0.0) if fault else 0.0
+    if isinstance(onset, (tuple, list)):
+        onset = rng.uniform(onset[0], onset[1], size=(n_motors, 1))
+    else:
+        onset = np.full((n_motors, 1), float(onset))
+
+    return {'phases': phases, 'onset': onset}
+
+def contiguous_view(buffer, n_rows, n_cols):
+    # Reshape the front of a preallocated buffer rather than slicing it, so a
+    # short final chunk is still C-contiguous (required by Generator fills).
+    return buffer.reshape(-1)[:n_rows * n_cols].reshape(n_rows, n_cols)
+
+def add_harmonic(out, tmp, omega_t, freq, amp, phase):
+    # sin(wt + phi) = sin(wt)cos(phi) + cos(wt)sin(phi): the trig runs once on
+    # the shared time row and each motor only costs a broadcast multiply-add.
+    arg = freq * omega_t
+    np.multiply(np.sin(arg), amp * np.cos(phase), out=tmp)
+    out += tmp
+    if np.any(phase):
+        np.multiply(np.cos(arg), amp * np.sin(phase), out=tmp)
+        out += tmp
+
+def synthesize(spec, n_motors, n_samples, sample_rate=SAMPLE_RATE, rng=None,
+               start=0, params=None, noise=None, out=None, work=None, dtype=np.float64):
+    rng = rng if rng is not None else np.random.default_rng()
+    params = params if params is not None else draw_motor_params(spec, n_motors, rng)
+    noise = spec.get('noise', 0.0) if noise is None else noise
+    fault = spec.get('fault')
+
+    if out is None:
+        out = np.empty((n_motors, n_samples), dtype=dtype)
+    else:
+        out = contiguous_view(out, n_motors, n_samples)
+    if work is None:
+        work = np.empty((2,) + out.shape, dtype=out.dtype)
+    tmp = contiguous_view(work[0], n_motors, n_samples)
+
+    # One shared time row for every motor in the chunk.
+    t = (start + np.arange(n_samples)) / sample_rate
+    omega_t = 2 * np.pi * t
+
+    out.fill(0)
+    n_base = len(spec['harmonics'])
+    for k, (freq, amp) in enumerate(spec['harmonics']):
+        add_harmonic(out, tmp, omega_t, freq, amp, params['phases'][k])
+
+    if fault:
+        fault_sum = contiguous_view(work[1], n_motors, n_samples)
+        fault_sum.fill(0)
+        for k, (freq, amp) in enumerate(fault['harmonics']):
+            add_harmonic(fault_sum, tmp, omega_t, freq, amp, params['phases'][n_base + k])
+
+        ramp = fault.get('ramp', 0.0)
+        if ramp > 0:
+            np.subtract(t, params['onset'], out=tmp)
+            tmp /= ramp
+            np.clip(tmp, 0, 1, out=tmp)
+        else:
+            np.greater_equal(t, params['onset'], out=tmp, casting='unsafe')
+        fault_sum *= tmp
+        out += fault_sum
+
+    if noise > 0:
+        rng.standard_normal(out=tmp, dtype=out.dtype)
+        tmp *= noise
+        out += tmp
+
+    mod_freq, depth = spec.get('modulation', (0.0, 0.0))
+    if depth > 0:
+        out *= 1.0 + depth * np.sin(mod_freq * omega_t)
+
+    out += spec.get('offset', 0.0)
+
+    return out
+
+def stream(spec, n_motors, n_samples, chunk_size=CHUNK_SIZE, sample_rate=SAMPLE_RATE,
+           seed=None, dtype=np.float32):
+    # Yields (start_sample, chunk) pairs. The chunk buffer is reused between
+    # iterations, so consumers must copy anything they want to keep.
+    rng = np.random.default_rng(seed)
+    params = draw_motor_params(spec, n_motors, rng)
+    buffer = np.empty((n_motors, chunk_size), dtype=dtype)
+    work = np.empty((2, n_motors, chunk_size), dtype=dtype)
+
+    for start in range(0, n_samples, chunk_size):
+        size = min(chunk_size, n_samples - start)
+        yield start, synthesize(spec, n_motors, size, sample_rate, rng, start, params,
+                                out=buffer, work=work)
+
+def generate_scenario(name, duration, sample_rate=SAMPLE_RATE, rng=None, noise=None):
+    n_samples = int(duration * sample_rate)
+    signal = synthesize(SCENARIOS[name], 1, n_samples, sample_rate, rng, noise=noise)[0]
+    return np.arange(n_samples) / sample_rate, signal
+
+def run_load_test():
+    print("=" * 60)
+    print("Synthetic Signal Load Test")
+    print("=" * 60)
+
+    spec = SCENARIOS[LOAD_TEST_SCENARIO]
+    total = LOAD_TEST_MOTORS * LOAD_TEST_SAMPLES
+
+    print(f"\nScenario: {LOAD_TEST_SCENARIO}")
+    print(f"Motors: {LOAD_TEST_MOTORS}")
+    print(f"Samples per motor: {LOAD_TEST_SAMPLES:,}")
+    print(f"Total samples: {total:,}")
+
+    start_time = time.perf_counter()
+    peak = -np.inf
+    for _, chunk in stream(spec, LOAD_TEST_MOTORS, LOAD_TEST_SAMPLES, seed=42):
+        peak = max(peak, float(chunk.max()))
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\nElapsed: {elapsed:.2f} s")
+    print(f"Throughput: {total / elapsed / 1e6:.1f} M samples/s")
+    print(f"Peak amplitude: {peak:.2f}")
+
+if __name__ == "__main__":
+    run_load_test()
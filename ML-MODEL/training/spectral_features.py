@@ -0,0 +1,212 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from functools import lru_cache
+import time
+
+SAMPLE_RATE = 100
+WINDOW_SIZE = 64
+
+# Frequency bands (Hz) for band-power features. Bands above the Nyquist
+# frequency of the chosen sample rate simply report zero power.
+FAULT_BANDS = {
+    'rotor': (30.0, 40.0),
+    'base': (55.0, 65.0),
+    'bearing': (110.0, 130.0),
+    'bearing_2x': (230.0, 250.0)
+}
+
+BENCHMARK_SECONDS = 20000
+BENCHMARK_REPEATS = 3
+
+# numpy.fft has no explicit plan objects, so the reusable parts of a
+# transform are cached here and every window goes through one batched rfft.
+@lru_cache(maxsize=32)
+def analysis_window(n, kind='hann'):
+    if kind == 'hann':
+        window = np.hanning(n + 1)[:-1]
+    elif kind == 'boxcar':
+        window = np.ones(n)
+    else:
+        raise ValueError(f"Unknown window: {kind}")
+    window.setflags(write=False)
+    return window
+
+@lru_cache(maxsize=32)
+def frequency_grid(n, sample_rate):
+    freqs = np.fft.rfftfreq(n, 1 / sample_rate)
+    freqs.setflags(write=False)
+    return freqs
+
+@lru_cache(maxsize=32)
+def band_matrix(n, sample_rate, bands):
+    # (n_bins, n_bands) 0/1 matrix so band powers are one matmul.
+    freqs = frequency_grid(n, sample_rate)
+    matrix = np.zeros((len(freqs), len(bands)))
+    for j, (lo, hi) in enumerate(bands):
+        matrix[(freqs >= lo) & (freqs < hi), j] = 1.0
+    matrix.setflags(write=False)
+    return matrix
+
+def frame_signal(signal, window_size=WINDOW_SIZE, hop=None):
+    # Same windows as the original per-window loop:
+    # range(0, len(signal) - window_size, hop)
+    hop = hop or window_size // 2
+    if len(signal) < window_size:
+        return signal[:0].reshape(0, window_size)
+    n_windows = max(0, int(np.ceil((len(signal) - window_size) / hop)))
+    frames = sliding_window_view(signal, window_size)[::hop]
+    return frames[:n_windows]
+
+def power_spectrum(frames, sample_rate, window='hann'):
+    n = frames.shape[-1]
+    w = analysis_window(n, window)
+    centered = frames - frames.mean(axis=-1, keepdims=True)
+    spectrum = np.fft.rfft(centered * w, axis=-1)
+
+    psd = (spectrum.real ** 2 + spectrum.imag ** 2) / (sample_rate * np.sum(w ** 2))
+    if n % 2 == 0:
+        psd[..., 1:-1] *= 2
+    else:
+        psd[..., 1:] *= 2
+    return frequency_grid(n, sample_rate), psd
+
+def welch_psd(frames, sample_rate, nperseg=None, noverlap=None, window='hann'):
+    # Welch estimate for every frame at once: split each frame into
+    # overlapping segments, take all periodograms in one rfft, then average.
+    nperseg = nperseg or frames.shape[-1]
+    noverlap = nperseg // 2 if noverlap is None else noverlap
+    segments = sliding_window_view(frames, nperseg, axis=-1)[..., ::nperseg - noverlap, :]
+    freqs, psd = power_spectrum(segments, sample_rate, window)
+    return freqs, psd.mean(axis=-2)
+
+def dominant_frequency(freqs, psd):
+    # Skip the DC bin, as the per-window extractor does.
+    return freqs[np.argmax(psd[..., 1:], axis=-1) + 1]
+
+def band_powers(psd, sample_rate, n_fft, bands=FAULT_BANDS):
+    df = sample_rate / n_fft
+    return psd @ band_matrix(n_fft, sample_rate, tuple(bands.values())) * df
+
+def window_features(signal, window_size=WINDOW_SIZE, sample_rate=SAMPLE_RATE, hop=None):
+    # Vectorised equivalent of generate_dataset.extract_features: the same
+    # eight columns, computed for all windows with array reductions.
+    frames = frame_signal(np.asarray(signal, dtype=float), window_size, hop)
+    if len(frames) == 0:
+        return np.empty((0, 8))
+
+    mean = frames.mean(axis=1)
+    peak = frames.max(axis=1)
+    energy = np.mean(frames ** 2, axis=1)
+    rms = np.sqrt(energy)
+
+    std = frames.std(axis=1)
+    safe_std = np.where(std > 0, std, 1.0)
+    z = (frames - mean[:, None]) / safe_std[:, None]
+    skewness = np.where(std > 0, np.mean(z ** 3, axis=1), 0.0)
+    kurtosis = np.where(std > 0, np.mean(z ** 4, axis=1), 0.0)
+
+    freqs, psd = power_spectrum(frames, sample_rate, window='boxcar')
+    half = window_size // 2
+    dominant_freq = dominant_frequency(freqs[:half], psd[:, :half])
+
+    safe_mean = np.where(mean > 0, mean, 1.0)
+    harmonic_ratio = np.where(mean > 0, peak / safe_mean, 0.0)
+
+    return np.column_stack([mean, peak, rms, skewness, kurtosis,
+                            dominant_freq, harmonic_ratio, energy])
+
+def spectral_features(signal, window_size=256, sample_rate=SAMPLE_RATE, hop=None,
+                      nperseg=None, bands=FAULT_BANDS):
+    # Higher-resolution spectral features: Welch PSD per window, then the
+    # dominant frequency, per-band power and total power for every window.
+    frames = frame_signal(np.asarray(signal, dtype=float), window_size, hop)
+    nperseg = nperseg or min(window_size, 128)
+    freqs, psd = welch_psd(frames, sample_rate, nperseg)
+
+    powers = band_powers(psd, sample_rate, nperseg, bands)
+    total = psd.sum(axis=-1) * sample_rate / nperseg
+
+    return {
+        'freqs': freqs,
+        'psd': psd,
+        'dominant_freq': dominant_frequency(freqs, psd),
+        'band_powers': powers,
+        'band_names': list(bands),
+        'total_power': total
+    }
+
+def per_window_features(signal, window_size=WINDOW_SIZE, sample_rate=SAMPLE_RATE):
+    # Reference implementation: one FFT and one fftfreq per window.
+    features = []
+
+    for i in range(0, len(signal) - window_size, window_size // 2):
+        window = signal[i:i+window_size]
+
+        mean = np.mean(window)
+        peak = np.max(window)
+        rms = np.sqrt(np.mean(window**2))
+
+        skewness = np.mean(((window - mean) / np.std(window))**3) if np.std(window) > 0 else 0
+        kurtosis = np.mean(((window - mean) / np.std(window))**4) if np.std(window) > 0 else 0
+
+        window_centered = window - mean
+        fft = np.fft.fft(window_centered)
+        freqs = np.fft.fftfreq(len(window), 1/sample_rate)
+
+        positive_freqs = freqs[:len(window)//2]
+        positive_fft = np.abs(fft[:len(window)//2])
+
+        dominant_freq = abs(positive_freqs[np.argmax(positive_fft[1:]) + 1])
+
+        harmonic_ratio = peak / mean if mean > 0 else 0
+        energy = np.sum(window**2) / len(window)
+
+        features.append([mean, peak, rms, skewness, kurtosis, dominant_freq, harmonic_ratio, energy])
+
+    return np.array(features)
+
+def time_call(fn, *args, **kwargs):
+    best = np.inf
+    for _ in range(BENCHMARK_REPEATS):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def benchmark():
+    from signal_scenarios import generate_scenario
+
+    print("=" * 60)
+    print("Spectral Feature Engine Benchmark")
+    print("=" * 60)
+
+    _, signal = generate_scenario('bearing_fault', BENCHMARK_SECONDS, SAMPLE_RATE,
+                                  np.random.default_rng(42))
+    n_windows = len(frame_signal(signal, WINDOW_SIZE))
+
+    print(f"\nSignal: {len(signal):,} samples at {SAMPLE_RATE} Hz")
+    print(f"Windows: {n_windows:,} x {WINDOW_SIZE} samples (50% overlap)")
+
+    t_loop, ref = time_call(per_window_features, signal)
+    t_vec, fast = time_call(window_features, signal)
+
+    print(f"\nPer-window FFT loop: {t_loop:.3f} s ({n_windows / t_loop:,.0f} windows/s)")
+    print(f"Batched engine:      {t_vec:.3f} s ({n_windows / t_vec:,.0f} windows/s)")
+    print(f"Speedup:             {t_loop / t_vec:.1f}x")
+    print(f"Max abs difference:  {np.max(np.abs(ref - fast)):.2e}")
+
+    hi_rate = 1000
+    _, hi_signal = generate_scenario('bearing_fault', BENCHMARK_SECONDS // 10, hi_rate,
+                                     np.random.default_rng(42))
+    t_spec, spec = time_call(spectral_features, hi_signal, 1024, hi_rate, nperseg=256)
+    n_spec = len(spec['dominant_freq'])
+
+    print(f"\nWelch features at {hi_rate} Hz (1024-sample windows, 256-point segments):")
+    print(f"  {n_spec:,} windows in {t_spec:.3f} s ({n_spec / t_spec:,.0f} windows/s)")
+    print(f"  Resolution: {hi_rate / 256:.2f} Hz per bin")
+    print(f"  Median dominant frequency: {np.median(spec['dominant_freq']):.1f} Hz")
+    for name, power in zip(spec['band_names'], spec['band_powers'].mean(axis=0)):
+        print(f"  {name:12s} band power: {power:.3f}")
+
+if __name__ == "__main__":
+    benchmark()
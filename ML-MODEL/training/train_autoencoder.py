@@ -5,8 +5,11 @@ from tensorflow import keras
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import matplotlib.pyplot as plt
-import json
 import os
+from plot_utils import shared_histogram
+from data_loader import ShardedFeatureLoader, fit_scaler
+from inference import FEATURE_NAMES
+from model_bundle import bundle_path, read_bundle, write_bundle
 
 INPUT_DIM = 8
 HIDDEN_DIM = 4
@@ -15,6 +18,10 @@ BATCH_SIZE = 32
 LEARNING_RATE = 0.001
 VALIDATION_SPLIT = 0.2
 
+# Set to a glob such as '../datasets/shards/*.csv' to stream training data
+# from sharded feature files instead of loading combined_dataset.csv.
+SHARD_PATTERN = os.environ.get('SHARD_PATTERN')
+
 class Autoencoder(keras.Model):
     def __init__(self, input_dim, hidden_dim):
         super(Autoencoder, self).__init__()
@@ -147,9 +154,13 @@ def plot_results(history, train_mse, val_mse, anomaly_mse, threshold):
     axes[0].legend()
     axes[0].grid(True, alpha=0.3)
 
-    axes[1].hist(train_mse, bins=50, alpha=0.7, label='Normal (train)', color='green')
-    axes[1].hist(val_mse, bins=50, alpha=0.7, label='Normal (val)', color='blue')
-    axes[1].hist(anomaly_mse, bins=50, alpha=0.7, label='Anomaly', color='red')
+    shared_histogram(
+        axes[1],
+        [train_mse, val_mse, anomaly_mse],
+        ['Normal (train)', 'Normal (val)', 'Anomaly'],
+        ['green', 'blue', 'red'],
+        bins=50
+    )
     axes[1].axvline(threshold, color='black', linestyle='--', linewidth=2, label=f'Threshold: {threshold:.4f}')
     axes[1].set_title('Reconstruction Error Distribution', fontsize=14, fontweight='bold')
     axes[1].set_xlabel('Reconstruction Error (MSE)')
@@ -162,46 +173,123 @@ def plot_results(history, train_mse, val_mse, anomaly_mse, threshold):
     print(f"\nVisualization saved to: ../models/training_results.png")
     plt.close()
 
-def export_model(model, scaler, threshold):
+def export_model(model, scaler, threshold, metadata=None):
     print("\n" + "=" * 60)
     print("Exporting Model")
     print("=" * 60)
 
-    os.makedirs('../models', exist_ok=True)
-
     encoder_weights = model.encoder.layers[0].get_weights()[0]
     encoder_bias = model.encoder.layers[0].get_weights()[1]
     decoder_weights = model.decoder.get_weights()[0]
     decoder_bias = model.decoder.get_weights()[1]
 
-    np.save('../models/encoder_weights.npy', encoder_weights)
-    np.save('../models/encoder_bias.npy', encoder_bias)
-    np.save('../models/decoder_weights.npy', decoder_weights)
-    np.save('../models/decoder_bias.npy', decoder_bias)
-    np.save('../models/scaler_mean.npy', scaler.mean_)
-    np.save('../models/scaler_std.npy', scaler.scale_)
+    tensors = {
+        'encoder_weights': encoder_weights,
+        'encoder_bias': encoder_bias,
+        'decoder_weights': decoder_weights,
+        'decoder_bias': decoder_bias,
+        'scaler_mean': scaler.mean_,
+        'scaler_std': scaler.scale_
+    }
 
-    config = {
+    attributes = {
         'input_dim': INPUT_DIM,
         'hidden_dim': HIDDEN_DIM,
         'threshold': float(threshold),
-        'scaler_mean': scaler.mean_.tolist(),
-        'scaler_std': scaler.scale_.tolist()
+        'feature_names': FEATURE_NAMES
     }
 
-    with open('../models/model_config.json', 'w') as f:
-        json.dump(config, f, indent=2)
+    training = {
+        'epochs': EPOCHS,
+        'batch_size': BATCH_SIZE,
+        'learning_rate': LEARNING_RATE,
+        'data': SHARD_PATTERN or '../datasets/combined_dataset.csv'
+    }
+    training.update(metadata or {})
+
+    # The fault classifier is trained separately on raw features, so a
+    # retrained autoencoder keeps the classifier already in the bundle.
+    if os.path.exists(bundle_path('../models')):
+        header, existing = read_bundle(bundle_path('../models'))
+        for name, array in existing.items():
+            if name.startswith('classifier_'):
+                tensors[name] = np.array(array)
+        if 'classes' in header['attributes']:
+            attributes['classes'] = header['attributes']['classes']
+
+    write_bundle(bundle_path('../models'), tensors, attributes, training)
+
+    print(f"\nModel saved to: {bundle_path('../models')}")
+    for name, array in tensors.items():
+        print(f"  - {name:24s} {array.shape}")
+    print(f"  - {'threshold':24s} {float(threshold):.6f}")
+
+def streaming_errors(model, loader):
+    for batch in loader:
+        pred = model.predict_on_batch(batch)
+        yield np.mean(np.square(batch - pred), axis=1)
+
+def train_streaming(shard_pattern):
+    print("=" * 60)
+    print("Streaming Sharded Training Data")
+    print("=" * 60)
+    print(f"\nShards: {shard_pattern}")
+
+    scaler = fit_scaler(shard_pattern, holdout=VALIDATION_SPLIT)
+    train_loader = ShardedFeatureLoader(shard_pattern, scaler, BATCH_SIZE,
+                                        holdout=VALIDATION_SPLIT, subset='train')
+    val_loader = ShardedFeatureLoader(shard_pattern, scaler, BATCH_SIZE * 32,
+                                      holdout=VALIDATION_SPLIT, subset='val', shuffle=False)
+
+    print(f"Normal rows seen by scaler: {int(np.max(scaler.n_samples_seen_)):,}")
+
+    model = Autoencoder(INPUT_DIM, HIDDEN_DIM)
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=LEARNING_RATE),
+        loss='mse',
+        metrics=['mae']
+    )
+
+    early_stopping = keras.callbacks.EarlyStopping(
+        monitor='val_loss',
+        patience=10,
+        restore_best_weights=True
+    )
+
+    history = model.fit(
+        train_loader.to_tf_dataset(),
+        epochs=EPOCHS,
+        validation_data=val_loader.to_tf_dataset(),
+        callbacks=[early_stopping],
+        verbose=1
+    )
+
+    # Threshold from running moments of the validation errors, then a
+    # second pass to count false positives against it.
+    count, total, total_sq = 0, 0.0, 0.0
+    for errors in streaming_errors(model, val_loader):
+        count += len(errors)
+        total += errors.sum()
+        total_sq += np.square(errors).sum()
+    mean = total / count
+    threshold = mean + 2 * np.sqrt(max(total_sq / count - mean ** 2, 0.0))
+
+    false_positives = sum(int(np.sum(errors > threshold)) for errors in streaming_errors(model, val_loader))
 
-    print(f"\nModel weights saved to: ../models/")
-    print(f"  - encoder_weights.npy")
-    print(f"  - encoder_bias.npy")
-    print(f"  - decoder_weights.npy")
-    print(f"  - decoder_bias.npy")
-    print(f"  - scaler_mean.npy")
-    print(f"  - scaler_std.npy")
-    print(f"  - model_config.json")
+    print(f"\nValidation windows: {count:,}")
+    print(f"Final training loss: {history.history['loss'][-1]:.4f}")
+    print(f"Recommended Threshold: {threshold:.4f}")
+    print(f"False Positive Rate: {false_positives / count * 100:.2f}%")
+
+    return model, scaler, threshold
 
 def main():
+    if SHARD_PATTERN:
+        model, scaler, threshold = train_streaming(SHARD_PATTERN)
+        export_model(model, scaler, threshold)
+        print("\n✅ Model ready for deployment to ESP32\n")
+        return
+
     X, y, df = load_data()
     X_train, X_val, X_anomaly, scaler = preprocess_data(X, y)
     model, history = train_model(X_train, X_val)
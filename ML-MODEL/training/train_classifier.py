@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import confusion_matrix
+import json
+import os
+import time
+from inference import FEATURE_NAMES, load_weights, reconstruction_error
+from model_bundle import bundle_path, read_bundle, update_bundle
+
+CLASSES = ['normal', 'bearing_fault', 'rotor_imbalance']
+EPOCHS = 2000
+LEARNING_RATE = 0.1
+L2_PENALTY = 1e-3
+VALIDATION_SPLIT = 0.2
+BATCH_SIZE = 4096
+LATENCY_ROWS = 200000
+MODELS_DIR = '../models'
+
+def softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+def has_classifier(models_dir=MODELS_DIR):
+    if os.path.exists(bundle_path(models_dir)):
+        header, _ = read_bundle(bundle_path(models_dir), verify=False)
+        return 'classifier_weights' in header['tensors']
+    return os.path.exists(f'{models_dir}/classifier_config.json')
+
+def load_classifier(models_dir=MODELS_DIR):
+    if os.path.exists(bundle_path(models_dir)):
+        header, tensors = read_bundle(bundle_path(models_dir))
+        if 'classifier_weights' in tensors:
+            return {
+                'classes': header['attributes']['classes'],
+                'weights': tensors['classifier_weights'],
+                'bias': tensors['classifier_bias'],
+                'scaler_mean': tensors['classifier_scaler_mean'],
+                'scaler_std': tensors['classifier_scaler_std']
+            }
+
+    with open(f'{models_dir}/classifier_config.json', 'r') as f:
+        config = json.load(f)
+
+    return {
+        'classes': config['classes'],
+        'weights': np.load(f'{models_dir}/classifier_weights.npy'),
+        'bias': np.load(f'{models_dir}/classifier_bias.npy'),
+        'scaler_mean': np.asarray(config['scaler_mean']),
+        'scaler_std': np.asarray(config['scaler_std'])
+    }
+
+def classify(classifier, X):
+    scaled = (np.asarray(X, dtype=np.float64) - classifier['scaler_mean']) / classifier['scaler_std']
+    return np.argmax(scaled @ classifier['weights'] + classifier['bias'], axis=1)
+
+def classify_flagged(weights, classifier, X, batch_size=BATCH_SIZE):
+    # Two-stage inference: the autoencoder scores every window and only the
+    # windows it flags are passed, in batches, to the fault classifier.
+    # Windows that are not flagged get class -1.
+    scores = reconstruction_error(weights, X)
+    flagged = np.flatnonzero(scores > weights['threshold'])
+
+    classes = np.full(len(X), -1, dtype=np.int64)
+    for start in range(0, len(flagged), batch_size):
+        rows = flagged[start:start + batch_size]
+        classes[rows] = classify(classifier, X[rows])
+
+    return scores, classes
+
+def train_softmax(X, y, n_classes):
+    # Full-batch gradient descent on class-weighted cross-entropy, so the
+    # small fault classes are not drowned out by normal windows.
+    n_samples, n_features = X.shape
+    W = np.zeros((n_features, n_classes))
+    b = np.zeros(n_classes)
+
+    counts = np.bincount(y, minlength=n_classes)
+    sample_weight = (n_samples / (n_classes * np.maximum(counts, 1)))[y]
+    targets = np.eye(n_classes)[y]
+
+    for epoch in range(EPOCHS):
+        probs = softmax(X @ W + b)
+        grad = (probs - targets) * sample_weight[:, None] / n_samples
+        W -= LEARNING_RATE * (X.T @ grad + L2_PENALTY * W)
+        b -= LEARNING_RATE * grad.sum(axis=0)
+
+        if epoch % 500 == 0 or epoch == EPOCHS - 1:
+            loss = -np.sum(sample_weight * np.log(probs[np.arange(n_samples), y] + 1e-12)) / n_samples
+            print(f"  Epoch {epoch:4d}: loss {loss:.4f}")
+
+    return W, b
+
+def export_classifier(W, b, scaler, models_dir=MODELS_DIR):
+    if os.path.exists(bundle_path(models_dir)):
+        # The classifier ships inside the autoencoder's bundle so both stages
+        # are always deployed from the same file.
+        update_bundle(bundle_path(models_dir), tensors={
+            'classifier_weights': W,
+            'classifier_bias': b,
+            'classifier_scaler_mean': scaler.mean_,
+            'classifier_scaler_std': scaler.scale_
+        }, attributes={'classes': CLASSES})
+        print(f"\nClassifier added to: {bundle_path(models_dir)}")
+        return
+
+    os.makedirs(models_dir, exist_ok=True)
+    np.save(f'{models_dir}/classifier_weights.npy', W)
+    np.save(f'{models_dir}/classifier_bias.npy', b)
+
+    config = {
+        'classes': CLASSES,
+        'feature_names': FEATURE_NAMES,
+        'scaler_mean': scaler.mean_.tolist(),
+        'scaler_std': scaler.scale_.tolist()
+    }
+
+    with open(f'{models_dir}/classifier_config.json', 'w') as f:
+        json.dump(config, f, indent=2)
+
+    print(f"\nClassifier saved to: {models_dir}/")
+    print(f"  - classifier_weights.npy")
+    print(f"  - classifier_bias.npy")
+    print(f"  - classifier_config.json")
+
+def report_latency(weights, classifier, X):
+    print("\n" + "=" * 60)
+    print("Two-Stage Inference Latency")
+    print("=" * 60)
+
+    rng = np.random.default_rng(42)
+    X_bench = X[rng.integers(0, len(X), size=LATENCY_ROWS)]
+
+    start = time.perf_counter()
+    reconstruction_error(weights, X_bench)
+    ae_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, classes = classify_flagged(weights, classifier, X_bench)
+    total_time = time.perf_counter() - start
+
+    n_flagged = int(np.sum(classes >= 0))
+    added = max(total_time - ae_time, 0.0)
+    macs = len(FEATURE_NAMES) * len(CLASSES)
+
+    print(f"\nWindows: {LATENCY_ROWS:,}, flagged: {n_flagged:,} ({n_flagged / LATENCY_ROWS:.1%})")
+    print(f"Autoencoder only:  {ae_time / LATENCY_ROWS * 1e6:.3f} us/window")
+    print(f"With classifier:   {total_time / LATENCY_ROWS * 1e6:.3f} us/window")
+    print(f"Added per window:  {added / LATENCY_ROWS * 1e6:.3f} us "
+          f"({added / max(n_flagged, 1) * 1e6:.3f} us per flagged window)")
+    print(f"Embedded cost:     {macs} multiply-adds + {len(FEATURE_NAMES)} divisions per flagged window")
+
+def main():
+    print("=" * 60)
+    print("Training Fault Type Classifier")
+    print("=" * 60)
+
+    df = pd.read_csv('../datasets/combined_dataset.csv')
+    X = df[FEATURE_NAMES].values
+    y = df['fault_type'].map({name: i for i, name in enumerate(CLASSES)}).values
+
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=VALIDATION_SPLIT, random_state=42, stratify=y
+    )
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+
+    print(f"\nClasses: {', '.join(CLASSES)}")
+    print(f"Training samples: {len(X_train)}")
+    print(f"Validation samples: {len(X_val)}\n")
+
+    W, b = train_softmax(X_train_scaled, y_train, len(CLASSES))
+    export_classifier(W, b, scaler)
+
+    classifier = load_classifier()
+    val_pred = classify(classifier, X_val)
+
+    print(f"\nValidation accuracy: {np.mean(val_pred == y_val) * 100:.2f}%")
+    print("Confusion matrix (rows: true, cols: predicted):")
+    print(pd.DataFrame(confusion_matrix(y_val, val_pred, labels=range(len(CLASSES))),
+                       index=CLASSES, columns=CLASSES))
+
+    if os.path.exists(bundle_path(MODELS_DIR)) or os.path.exists(f'{MODELS_DIR}/model_config.json'):
+        weights = load_weights()
+        _, classes = classify_flagged(weights, classifier, X_val)
+        flagged = classes >= 0
+        if flagged.any():
+            print(f"\nOn autoencoder-flagged validation windows ({flagged.sum()}):")
+            print(f"  Classifier accuracy: {np.mean(classes[flagged] == y_val[flagged]) * 100:.2f}%")
+        report_latency(weights, classifier, X)
+
+    print("\n✅ Classifier ready, run export_to_cpp.py to add it to model_weights.h\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from export_to_cpp import export_weights_to_cpp
+from inference import FEATURE_NAMES, load_weights, reconstruction_error
+from train_classifier import classify, has_classifier, load_classifier
+
+MODELS_DIR = '../models'
+# The header rendered for the check is kept here so a failure can be inspected.
+VERIFY_HEADER_PATH = '../exports/verify/model_weights.h'
+DATASET_PATH = '../datasets/combined_dataset.csv'
+GOLDEN_BATCH = 200000
+JITTER = 0.05
+# A C score agrees when |c - py| <= SCORE_ATOL + SCORE_RTOL * |py|; the
+# relative term covers large reconstruction errors held in float32.
+SCORE_ATOL = 1e-3
+SCORE_RTOL = 1e-4
+MAX_DECISION_MISMATCHES = 0
+CC = os.environ.get('CC', 'cc')
+CFLAGS = ['-std=c99', '-O2', '-Wall']
+
+HARNESS_SOURCE = r'''#include <stdio.h>
+#include <stdbool.h>
+#include "model_weights.h"
+
+int main(int argc, char **argv) {
+  if (argc != 3) {
+    fprintf(stderr, "usage: %s features.bin results.bin\n", argv[0]);
+    return 2;
+  }
+
+  FILE *in = fopen(argv[1], "rb");
+  FILE *out = fopen(argv[2], "wb");
+  if (!in || !out) {
+    perror("fopen");
+    return 1;
+  }
+
+  float features[INPUT_DIM];
+  while (fread(features, sizeof(float), INPUT_DIM, in) == INPUT_DIM) {
+    float score = runInference(features);
+    unsigned char flag = isAnomalous(features) ? 1 : 0;
+#ifdef NUM_FAULT_CLASSES
+    signed char fault = (signed char)classifyFault(features);
+#else
+    signed char fault = -1;
+#endif
+    fwrite(&score, sizeof(float), 1, out);
+    fwrite(&flag, 1, 1, out);
+    fwrite(&fault, 1, 1, out);
+  }
+
+  fclose(in);
+  fclose(out);
+  return 0;
+}
+'''
+
+RESULT_DTYPE = np.dtype([('score', '<f4'), ('flag', 'u1'), ('fault', 'i1')])
+
+def build_golden_batch(n_rows=GOLDEN_BATCH, seed=42):
+    # Resample the dataset rows and jitter them by a fraction of each
+    # feature's spread, so the batch covers the space around the threshold.
+    df = pd.read_csv(DATASET_PATH)
+    X = df[FEATURE_NAMES].values
+    rng = np.random.default_rng(seed)
+    rows = X[rng.integers(0, len(X), size=n_rows)]
+    rows += rng.standard_normal(rows.shape) * X.std(axis=0) * JITTER
+    return np.vstack([X, rows]).astype(np.float32)
+
+def compile_harness(header_path, workdir):
+    shutil.copy(header_path, f'{workdir}/model_weights.h')
+    source = f'{workdir}/harness.c'
+    binary = f'{workdir}/harness'
+    with open(source, 'w') as f:
+        f.write(HARNESS_SOURCE)
+
+    subprocess.run([CC, *CFLAGS, '-o', binary, source], check=True, cwd=workdir)
+    return binary
+
+def run_harness(binary, X, workdir):
+    features_path = f'{workdir}/features.bin'
+    results_path = f'{workdir}/results.bin'
+    np.ascontiguousarray(X, dtype='<f4').tofile(features_path)
+
+    subprocess.run([binary, features_path, results_path], check=True)
+
+    results = np.fromfile(results_path, dtype=RESULT_DTYPE)
+    if len(results) != len(X):
+        raise RuntimeError(f"Harness returned {len(results)} results for {len(X)} rows")
+    return results['score'], results['flag'].astype(bool), results['fault'].astype(np.int64)
+
+def compare(weights, X, c_scores, c_flags, c_faults, classifier=None):
+    py_scores = reconstruction_error(weights, X)
+    py_flags = py_scores > weights['threshold']
+
+    abs_err = np.abs(c_scores.astype(np.float64) - py_scores)
+    rel_err = abs_err / np.maximum(np.abs(py_scores), 1e-12)
+    # A row whose Python score sits closer to the threshold than the C
+    # score's float32 error can land on either side; only count the rest.
+    disagree = c_flags != py_flags
+    at_boundary = np.abs(py_scores - weights['threshold']) <= abs_err
+    mismatches = np.flatnonzero(disagree & ~at_boundary)
+    fault_mismatches = 0
+    if classifier is not None:
+        fault_mismatches = int(np.sum(c_faults != classify(classifier, X)))
+
+    return {
+        'rows': len(X),
+        'max_abs_error': float(abs_err.max()),
+        'score_violations': int(np.sum(abs_err > SCORE_ATOL + SCORE_RTOL * np.abs(py_scores))),
+        'max_rel_error': float(rel_err.max()),
+        'mean_abs_error': float(abs_err.mean()),
+        'decision_mismatches': len(mismatches),
+        'boundary_mismatches': int(np.sum(disagree & at_boundary)),
+        'fault_mismatches': fault_mismatches,
+        'mismatch_rows': mismatches,
+        'py_scores': py_scores,
+        'abs_err': abs_err
+    }
+
+def verify_export(models_dir=MODELS_DIR, header_path=None, n_rows=GOLDEN_BATCH):
+    print("=" * 60)
+    print("Cross-checking Exported C Header Against Python Model")
+    print("=" * 60)
+
+    weights = load_weights(models_dir)
+    X = build_golden_batch(n_rows)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if header_path is None:
+            header_path = export_weights_to_cpp(models_dir, VERIFY_HEADER_PATH)
+        binary = compile_harness(header_path, workdir)
+        c_scores, c_flags, c_faults = run_harness(binary, X, workdir)
+
+    classifier = None
+    if has_classifier(models_dir):
+        classifier = load_classifier(models_dir)
+
+    report = compare(weights, X, c_scores, c_flags, c_faults, classifier)
+
+    print(f"\nHeader: {header_path}")
+    print(f"Compiler: {CC} {' '.join(CFLAGS)}")
+    print(f"Golden vectors: {report['rows']:,}")
+    print(f"\nScore agreement:")
+    print(f"  Max abs error:  {report['max_abs_error']:.3e}")
+    print(f"  Mean abs error: {report['mean_abs_error']:.3e}")
+    print(f"  Max rel error:  {report['max_rel_error']:.3e}")
+    print(f"  Outside tolerance (atol {SCORE_ATOL:g}, rtol {SCORE_RTOL:g}): {report['score_violations']}")
+    print(f"\nDecision mismatches: {report['decision_mismatches']}")
+    print(f"Boundary rows (within float32 error of threshold): {report['boundary_mismatches']}")
+    if classifier is not None:
+        print(f"Fault class mismatches: {report['fault_mismatches']}")
+
+    for row in report['mismatch_rows'][:10]:
+        print(f"  Row {row}: python={report['py_scores'][row]:.6f} "
+              f"c={c_scores[row]:.6f} threshold={weights['threshold']:.6f}")
+
+    return report
+
+def main():
+    report = verify_export()
+
+    passed = (report['score_violations'] == 0 and
+              report['decision_mismatches'] <= MAX_DECISION_MISMATCHES and
+              report['fault_mismatches'] <= MAX_DECISION_MISMATCHES)
+
+    print("\n" + "=" * 60)
+    print("Cross-check PASSED" if passed else "Cross-check FAILED")
+    print("=" * 60)
+
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()